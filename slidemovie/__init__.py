@@ -1,3 +1,11 @@
-from .core import Movie
-
 __all__ = ["Movie"]
+
+
+def __getattr__(name):
+    # Import the core module lazily so that `slidemovie.cli` can answer
+    # --help and argument errors without loading the TTS backends.
+    if name == "Movie":
+        from .core import Movie
+        globals()["Movie"] = Movie
+        return Movie
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
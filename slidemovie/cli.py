@@ -1,40 +1,34 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import argparse
 import sys
-import logging
-import slidemovie
-
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+
+# CLI options copied onto `Movie` attributes as-is: (argument name, attribute name)
+_OVERRIDES = (
+    ("tts_provider", "tts_provider"),
+    ("tts_model", "tts_model"),
+    ("tts_voice", "tts_voice"),
+    ("filename", "output_filename"),
 )
-logger = logging.getLogger(__name__)
 
+# Parser shared across main() calls (see `_get_parser()`)
+_PARSER = None
 
-def main():
+
+def build_parser():
     """
-    Entry point for the slidemovie command-line tool.
+    Builds the argument parser for the slidemovie command-line tool.
 
-    This function parses command-line arguments to control the `slidemovie.Movie` class,
-    which generates narration videos from Markdown and PowerPoint files.
+    This is a pure function with no side effects, so tools such as shell
+    completion generators can inspect the options without running `main()`.
 
-    Workflow:
-    1.  Parse arguments (project name, modes, options).
-    2.  Initialize the `Movie` class (loads default/config settings).
-    3.  Override settings based on CLI arguments (TTS options, debug mode).
-    4.  Configure project paths based on structure (flat or subproject).
-    5.  Execute the requested action:
-        - `--pptx`: Generates a draft PowerPoint from Markdown.
-        - `--video`: Generates the full narration video (TTS, images, stitching).
-
-    Usage:
-        slidemovie PROJECT_NAME [--pptx] [--video] [options...]
+    Returns:
+        argparse.ArgumentParser: The configured parser.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(
+        prog="slidemovie",
         description="Automated tool to generate narration videos from Markdown and PowerPoint."
     )
 
@@ -97,69 +91,115 @@ def main():
         help="Enable debug mode (Verbose logging, etc)."
     )
 
-    # 1. Initialize Movie instance (Load configuration files)
-    try:
-        movie = slidemovie.Movie()
-    except NameError:
-        logger.error(
-            "Movie class is not defined. Make sure to import it correctly.")
-        sys.exit(1)
-    except Exception as e:
-        logger.error(f"Failed to initialize Movie class: {e}")
-        sys.exit(1)
+    return parser
+
+
+def _get_parser():
+    """
+    Returns the shared parser, building it on first use.
+    Repeated `main()` calls in one process (tests, wrappers) reuse it.
+    """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = build_parser()
+    return _PARSER
 
-    args = parser.parse_args()
+
+def main():
+    """
+    Entry point for the slidemovie command-line tool.
+
+    This function parses command-line arguments to control the `slidemovie.Movie` class,
+    which generates narration videos from Markdown and PowerPoint files.
+
+    Workflow:
+    1.  Parse arguments (project name, modes, options).
+    2.  Import `slidemovie` and initialize the `Movie` class (loads default/config settings).
+    3.  Override settings based on CLI arguments (TTS options, debug mode).
+    4.  Configure project paths based on structure (flat or subproject).
+    5.  Execute the requested action:
+        - `--pptx`: Generates a draft PowerPoint from Markdown.
+        - `--video`: Generates the full narration video (TTS, images, stitching).
+
+    Usage:
+        slidemovie PROJECT_NAME [--pptx] [--video] [options...]
+    """
+    # --help is answered by argparse, so the text always matches the running
+    # Python's argparse layout
+    parser = _get_parser()
+    args = parser.parse_args(sys.argv[1:])
 
     # Exit if no action is specified
     if not args.pptx and not args.video:
         parser.print_help()
         sys.exit(1)
 
-    # 2. Override settings with CLI options
-    if args.tts_provider:
-        movie.tts_provider = args.tts_provider
-    if args.tts_model:
-        movie.tts_model = args.tts_model
-    if args.tts_voice:
-        movie.tts_voice = args.tts_voice
-    if args.prompt:
-        movie.prompt = args.prompt
-        movie.tts_use_prompt = True
-    if args.no_prompt:
-        movie.tts_use_prompt = False
-    if args.filename:
-        movie.output_filename = args.filename
-
-    if args.debug:
-        movie.ffmpeg_loglevel = 'info'
-        movie.show_skip = True
-        logging.getLogger("google_genai").setLevel(logging.DEBUG)
-        logging.getLogger("httpx").setLevel(logging.DEBUG)
-        logger.setLevel(logging.DEBUG)
-        logger.info("Debug mode enabled.")
-
-    # 3. Configure Path Settings
+    # Logging configuration (deferred so that --help stays cheap)
+    import logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    logger = logging.getLogger(__name__)
+
+    # Import the package only when an action will actually run
+    import slidemovie
+
+    # Steps 1-3 share one error handler; `stage` names the step for the message
+    stage = "initialize Movie class"
     try:
+        # 1. Initialize Movie instance (Load configuration files)
+        movie = slidemovie.Movie()
+
+        # 2. Override settings with CLI options
+        stage = "apply CLI options"
+        for arg_name, attr_name in _OVERRIDES:
+            value = getattr(args, arg_name)
+            if value:
+                setattr(movie, attr_name, value)
+        if args.prompt:
+            movie.prompt = args.prompt
+            movie.tts_use_prompt = True
+        if args.no_prompt:
+            movie.tts_use_prompt = False
+
+        if args.debug:
+            movie.ffmpeg_loglevel = 'info'
+            movie.show_skip = True
+            logging.getLogger("google_genai").setLevel(logging.DEBUG)
+            logging.getLogger("httpx").setLevel(logging.DEBUG)
+            logger.setLevel(logging.DEBUG)
+            logger.info("Debug mode enabled.")
+
+        # 3. Configure Path Settings
+        stage = "configure paths"
         if args.sub:
             # Hierarchical Mode (Parent/Child)
             logger.info(
                 f"Configuring subproject paths: {args.project_name}/{args.sub}")
-            movie.configure_subproject_paths(
-                parent_project_name=args.project_name,
-                subproject_name=args.sub,
-                source_parent_dir=args.source_dir,
-                output_root_dir=args.output_root
-            )
+            configure = movie.configure_subproject_paths
+            kwargs = {
+                "parent_project_name": args.project_name,
+                "subproject_name": args.sub,
+                "source_parent_dir": args.source_dir,
+            }
         else:
             # Standard Mode (Flat)
             logger.info(f"Configuring project paths: {args.project_name}")
-            movie.configure_project_paths(
-                project_name=args.project_name,
-                source_dir=args.source_dir,
-                output_root_dir=args.output_root
-            )
+            configure = movie.configure_project_paths
+            kwargs = {
+                "project_name": args.project_name,
+                "source_dir": args.source_dir,
+            }
+        # Output directories are only needed when building the video
+        configure(
+            output_root_dir=args.output_root,
+            include_output=args.video,
+            **kwargs
+        )
     except Exception as e:
-        logger.error(f"Failed to configure paths: {e}")
+        logger.error(f"Failed to {stage}: {e}")
         sys.exit(1)
 
     # 4. Execute Actions
@@ -1,19 +1,201 @@
+import copy
+import functools
+from collections import namedtuple
+from contextlib import contextmanager
 import json
 import os
 import hashlib
+import re
 import multiai_tts
 import subprocess
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import wave
 import sys
 import logging
 import shutil
+import struct
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Bytes read from each end of a file by `Movie._fingerprint_file()`
+_FINGERPRINT_CHUNK = 65536
+
+# Per-slide state changes buffered before the state file is rewritten
+_STATE_SAVE_INTERVAL = 16
+
+# Buffer size for files written by `_atomic_write()`
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# WAV files handled by one ffmpeg run in `Movie.prepend_silence_batch()`
+_SILENCE_BATCH_SIZE = 16
+
+# Slide ID marker in Markdown: <!-- slide-id: ... -->
+_SLIDE_ID_RE = re.compile(r'<!--\s*slide-id:\s*(.+?)\s*-->')
+
+# Line markers recognized by `Movie._parse_markdown()`
+_SLIDE_ID_PREFIX = "<!-- slide-id:"
+_SLIDE_ID_PREFIX_LEN = len(_SLIDE_ID_PREFIX)
+_VIDEO_FILE_PREFIX = "<!-- video-file:"
+_VIDEO_FILE_PREFIX_LEN = len(_VIDEO_FILE_PREFIX)
+_NOTES_OPEN = "::: notes"
+_NOTES_CLOSE = ":::"
+
+# One match per line dispatches on the marker kind (`match.lastindex`):
+# 1 slide-id, 2 video-file, 3 title ("# "), 4 notes open/close (whole stripped line)
+_MARKER_RE = re.compile(
+    f"({re.escape(_SLIDE_ID_PREFIX)})|({re.escape(_VIDEO_FILE_PREFIX)})|(# )"
+    f"|\\s*({re.escape(_NOTES_OPEN)}|{re.escape(_NOTES_CLOSE)})\\s*\\Z"
+)
+_MARKER_SLIDE_ID, _MARKER_VIDEO_FILE, _MARKER_TITLE, _MARKER_NOTES = 1, 2, 3, 4
+
+# Image written by pptxtoimages for the n-th slide: slide_<n>.png
+_IMG_RE = re.compile(r'slide_(\d+)\.png')
+
+# Output files of one slide in `movie_dir` (see `Movie._get_slide_paths()`)
+_SlidePaths = namedtuple("_SlidePaths", "id png wav mp4")
+
+# Shared TTS audio cache (see `Movie._get_tts_cache_path()`)
+_TTS_CACHE_DIR = "~/.cache/slidemovie/tts"
+
+
+def _read_json_file(path):
+    """
+    Parses a JSON file, using orjson when it is installed.
+    Both parsers raise `json.JSONDecodeError` on invalid input.
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dumps_json(obj):
+    """
+    Serializes `obj` to UTF-8 JSON bytes indented by 2 spaces, using orjson when it is installed.
+    Both paths produce equivalent JSON (float formatting may differ, e.g. 1e-05),
+    and key order is kept as-is (no key sorting), so the slide order chosen by
+    `_save_audio_state` is preserved.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _atomic_write(path, write, mode='w', **open_kwargs):
+    """
+    Writes a file by calling `write(f)` on a temporary file next to it
+    (with a 1 MiB buffer), then swaps it in with `os.replace`.
+    An interrupted write never leaves a truncated file behind.
+
+    Symlinks are followed, so the link stays in place and its target is
+    rewritten; the permission bits of an existing file are kept.
+
+    Args:
+        path (str): Target file path.
+        write (callable): Receives the open temporary file.
+        mode (str): 'w' (text) or 'wb' (binary).
+        **open_kwargs: Passed to `open()` (e.g. encoding, newline).
+    """
+    path = os.path.realpath(path)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, mode, buffering=_WRITE_BUFFER_SIZE, **open_kwargs) as f:
+            write(f)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path, mtime_ns, size):
+    """
+    Parses a JSON config file. Results are memoized per (path, mtime, size),
+    so repeated `Movie()` instances in one process skip re-parsing unchanged files.
+    """
+    return _read_json_file(path)
+
+
+def _load_config_file(path):
+    """
+    Returns a private copy of the parsed config file at `path`.
+    """
+    st = os.stat(path)
+    return copy.deepcopy(_read_config_file(
+        os.path.abspath(path), st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=1024)
+def _sha256_text(text):
+    """
+    Returns "sha256:<hex>" for the UTF-8 encoding of `text`.
+    Memoized, since unchanged notes and the TTS config are hashed again by
+    every `build_slide_audio()` call in the same process.
+    """
+    return "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_av():
+    """
+    Returns the PyAV module if it is installed, otherwise None.
+    Imported on first use, since loading the FFmpeg libraries takes a moment.
+    """
+    try:
+        import av
+    except ImportError:
+        return None
+    return av
+
+
+def _read_wav_duration(path):
+    """
+    Returns the duration (seconds) of a WAV file by walking its RIFF chunks,
+    or None if the header is not understood.
+    A data chunk size larger than the file (as written by streaming encoders)
+    is clamped to the bytes actually present.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        file_size = os.fstat(f.fileno()).st_size
+
+        sample_rate = block_align = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                if chunk_size < 16:
+                    return None
+                _, _, sample_rate, _, block_align, _ = struct.unpack(
+                    "<HHIIHH", f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if not sample_rate or not block_align:
+                    return None
+                data_size = min(chunk_size, file_size - f.tell())
+                return (data_size // block_align) / float(sample_rate)
+            else:
+                # Chunks are word-aligned
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
 
 class Movie():
     """
@@ -40,30 +222,42 @@ class Movie():
         2. ~/.config/slidemovie/config.json (User home directory)
         3. Default settings defined in `_get_default_settings()`
         """
+        self._tools_checked = False
         self._check_external_tools()
         self._load_settings()
+        self._md_cache = None
+        self._slide_paths = None
+        self._tts_local = threading.local()
+        self._state_pending = 0
+        self._mp4_digests = {}
         logging.getLogger("google_genai").setLevel(logging.WARNING)
         logging.getLogger("httpx").setLevel(logging.WARNING)
 
     def _check_external_tools(self):
         """
         Checks if required external command-line tools are installed.
-        Exits the program if any tool is missing.
+        Exits the program at the first missing tool, without probing the rest.
 
         Required tools:
             - ffmpeg
             - ffprobe
             - pandoc
+
+        The result is remembered, so later calls (e.g. from `build_all()`) return immediately.
         """
+        if self._tools_checked:
+            return
+
         required_tools = ['ffmpeg', 'ffprobe', 'pandoc']
-        missing_tools = [
-            tool for tool in required_tools if not shutil.which(tool)]
+        missing_tool = next(
+            (tool for tool in required_tools if not shutil.which(tool)), None)
 
-        if missing_tools:
+        if missing_tool:
             logger.error(
-                f"Required external commands not found: {', '.join(missing_tools)}")
-            logger.error("Please install them before running this tool.")
+                f"Required external command not found: {missing_tool}")
+            logger.error("Please install it before running this tool.")
             sys.exit(1)
+        self._tools_checked = True
 
     def _get_default_settings(self):
         """
@@ -80,6 +274,8 @@ class Movie():
             video_timescale (int): Video timescale. Default: 90000.
             video_pix_fmt (str): Pixel format. Default: 'yuv420p'.
             video_codec (str): Video codec. Default: 'libx264'.
+            x264_preset (str): libx264 preset for slide videos. Default: 'veryfast'.
+            video_crf (int): libx264 constant rate factor (quality) for slide videos. Default: 23.
             audio_codec (str): Audio codec. Default: 'aac'.
             sample_rate (int): Audio sample rate. Default: 44100.
             audio_bitrate (str): Audio bitrate. Default: '192k'.
@@ -88,6 +284,13 @@ class Movie():
             silence_sec (float): Silence duration inserted at the start of each slide (seconds). Default: 2.5.
             show_skip (bool): Whether to log skipped tasks. Default: False.
             max_retry (int): Max retries for TTS API errors. Default: 2.
+            tts_concurrency (int): Number of TTS requests sent in parallel. Default: 4.
+            tts_cache_enabled (bool): Whether to reuse previously synthesized audio from
+                ~/.cache/slidemovie/tts for identical text and TTS settings. Default: True.
+            tts_cache_max_bytes (int): Size limit of the TTS cache; the least recently used
+                files are removed beyond it. None or 0 means no limit. Default: 1 GiB.
+            ffmpeg_threads (int): Threads per ffmpeg encode. Slide videos are encoded in
+                parallel by (CPU count / ffmpeg_threads) processes. Default: 2.
             output_root (str): Root directory for video output. Default: None.
             output_filename (str): Output video filename (without extension). Default: None (Uses project ID).
         """
@@ -107,6 +310,8 @@ class Movie():
             "video_timescale": 90000,
             "video_pix_fmt": 'yuv420p',
             "video_codec": 'libx264',
+            "x264_preset": 'veryfast',
+            "video_crf": 23,
 
             # Audio settings
             "audio_codec": 'aac',
@@ -119,6 +324,10 @@ class Movie():
             "silence_sec": 2.5,
             "show_skip": False,
             "max_retry": 2,
+            "tts_concurrency": 4,
+            "tts_cache_enabled": True,
+            "tts_cache_max_bytes": 1073741824,
+            "ffmpeg_threads": 2,
 
             # Output path settings (Used if not provided via CLI)
             "output_root": None,
@@ -160,9 +369,7 @@ class Movie():
         else:
             # Load and merge if exists
             try:
-                with open(home_config_path, 'r', encoding='utf-8') as f:
-                    home_config = json.load(f)
-                    config.update(home_config)
+                config.update(_load_config_file(home_config_path))
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Failed to load {home_config_path}: {e}")
 
@@ -171,9 +378,7 @@ class Movie():
 
         if os.path.exists(local_config_path):
             try:
-                with open(local_config_path, 'r', encoding='utf-8') as f:
-                    local_config = json.load(f)
-                    config.update(local_config)
+                config.update(_load_config_file(local_config_path))
                 logger.info(f"Loaded local config: {local_config_path}")
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Failed to load {local_config_path}: {e}")
@@ -189,7 +394,7 @@ class Movie():
             setattr(self, key, value)
 
     def configure_project_paths(
-            self, project_name, source_dir, output_root_dir=None):
+            self, project_name, source_dir, output_root_dir=None, include_output=True):
         """
         Configures paths for a standard (flat) project structure.
 
@@ -198,6 +403,9 @@ class Movie():
             source_dir (str): The directory containing source files (.md, .pptx).
             output_root_dir (str, optional): Root directory for video output.
                                              Defaults to `self.output_root` or `{source_dir}/movie`.
+            include_output (bool, optional): If False, output paths are only computed;
+                                             the output directories are not checked or created.
+                                             Use this when only the PPTX is built.
         """
         # Determine output root directory
         target_root = None
@@ -208,30 +416,31 @@ class Movie():
         elif self.output_root:
             target_root = self.output_root
         else:
-            target_root = f'{source_dir}/movie'
+            target_root = os.path.join(source_dir, 'movie')
             is_automatic_path = True
 
         # Expand path
         target_root = os.path.expanduser(target_root)
 
-        # Handle directory existence
-        if is_automatic_path:
-            # If the path is automatically determined, create it if it doesn't
-            # exist
-            if not os.path.isdir(target_root):
-                try:
-                    os.makedirs(target_root, exist_ok=True)
-                    logger.info(f'Created output directory: {target_root}')
-                except OSError as e:
-                    logger.error(
-                        f'Failed to create directory {target_root}: {e}')
+        # Handle directory existence (skipped when output is not needed)
+        if include_output:
+            if is_automatic_path:
+                # If the path is automatically determined, create it if it doesn't
+                # exist
+                if not os.path.isdir(target_root):
+                    try:
+                        os.makedirs(target_root, exist_ok=True)
+                        logger.info(f'Created output directory: {target_root}')
+                    except OSError as e:
+                        logger.error(
+                            f'Failed to create directory {target_root}: {e}')
+                        sys.exit(1)
+            else:
+                # If the path is explicitly specified (CLI or Config), strict check
+                # is applied
+                if not os.path.isdir(target_root):
+                    logger.error(f'Directory {target_root} does not exist.')
                     sys.exit(1)
-        else:
-            # If the path is explicitly specified (CLI or Config), strict check
-            # is applied
-            if not os.path.isdir(target_root):
-                logger.error(f'Directory {target_root} does not exist.')
-                sys.exit(1)
 
         # Set member variables
         self.source_dir = source_dir
@@ -242,20 +451,21 @@ class Movie():
         final_filename = self.output_filename if self.output_filename else project_name
 
         # Construct file paths
-        self.md_file = f'{self.source_dir}/{project_name}.md'
-        self.status_file = f'{self.source_dir}/status.json'
-        self.video_length_file = f'{self.source_dir}/video_length.csv'
+        self.md_file = os.path.join(self.source_dir, f'{project_name}.md')
+        self.status_file = os.path.join(self.source_dir, 'status.json')
+        self.video_length_file = os.path.join(self.source_dir, 'video_length.csv')
 
         # Create intermediate/output directories
-        self.movie_dir = f'{target_root}/{project_name}'
-        if not os.path.isdir(self.movie_dir):
+        self.movie_dir = os.path.join(target_root, project_name)
+        if include_output and not os.path.isdir(self.movie_dir):
             os.mkdir(self.movie_dir)
 
-        self.slide_file = f'{self.source_dir}/{project_name}.pptx'
-        self.video_file = f'{self.movie_dir}/{final_filename}.mp4'
+        self.slide_file = os.path.join(self.source_dir, f'{project_name}.pptx')
+        self.video_file = os.path.join(self.movie_dir, f'{final_filename}.mp4')
 
     def configure_subproject_paths(
-            self, parent_project_name, subproject_name, source_parent_dir, output_root_dir=None):
+            self, parent_project_name, subproject_name, source_parent_dir, output_root_dir=None,
+            include_output=True):
         """
         Configures paths for a nested project structure (Parent Folder -> Child Folder).
 
@@ -264,6 +474,8 @@ class Movie():
             subproject_name (str): The name of the subproject (child folder name).
             source_parent_dir (str): The directory containing the parent project folder.
             output_root_dir (str, optional): Root directory for video output.
+            include_output (bool, optional): If False, output paths are only computed;
+                                             the output directories are not checked or created.
         """
         # Determine output root directory
         target_root = None
@@ -274,33 +486,34 @@ class Movie():
         elif self.output_root:
             target_root = self.output_root
         else:
-            target_root = f'{source_parent_dir}/movie'
+            target_root = os.path.join(source_parent_dir, 'movie')
             is_automatic_path = True
 
         # Expand path
         target_root = os.path.expanduser(target_root)
 
-        # Handle directory existence
-        if is_automatic_path:
-            # If the path is automatically determined, create it if it doesn't
-            # exist
-            if not os.path.isdir(target_root):
-                try:
-                    os.makedirs(target_root, exist_ok=True)
-                    logger.info(f'Created output directory: {target_root}')
-                except OSError as e:
-                    logger.error(
-                        f'Failed to create directory {target_root}: {e}')
+        # Handle directory existence (skipped when output is not needed)
+        if include_output:
+            if is_automatic_path:
+                # If the path is automatically determined, create it if it doesn't
+                # exist
+                if not os.path.isdir(target_root):
+                    try:
+                        os.makedirs(target_root, exist_ok=True)
+                        logger.info(f'Created output directory: {target_root}')
+                    except OSError as e:
+                        logger.error(
+                            f'Failed to create directory {target_root}: {e}')
+                        sys.exit(1)
+            else:
+                # If the path is explicitly specified (CLI or Config), strict check
+                # is applied
+                if not os.path.isdir(target_root):
+                    logger.error(f'Directory {target_root} does not exist.')
                     sys.exit(1)
-        else:
-            # If the path is explicitly specified (CLI or Config), strict check
-            # is applied
-            if not os.path.isdir(target_root):
-                logger.error(f'Directory {target_root} does not exist.')
-                sys.exit(1)
 
         # Source directory is "Parent/Child"
-        self.source_dir = f'{source_parent_dir}/{subproject_name}'
+        self.source_dir = os.path.join(source_parent_dir, subproject_name)
 
         # Project ID format: "Parent-Child"
         self.project_id = f'{parent_project_name}-{subproject_name}'
@@ -310,21 +523,22 @@ class Movie():
         final_filename = self.output_filename if self.output_filename else self.project_id
 
         # Construct file paths
-        self.md_file = f'{self.source_dir}/{subproject_name}.md'
-        self.status_file = f'{self.source_dir}/status.json'
-        self.video_length_file = f'{self.source_dir}/video_length.csv'
+        self.md_file = os.path.join(self.source_dir, f'{subproject_name}.md')
+        self.status_file = os.path.join(self.source_dir, 'status.json')
+        self.video_length_file = os.path.join(self.source_dir, 'video_length.csv')
 
         # Create output directory hierarchy (movie/parent/child)
-        parent_movie_dir = f'{target_root}/{parent_project_name}'
-        self.movie_dir = f'{parent_movie_dir}/{subproject_name}'
+        parent_movie_dir = os.path.join(target_root, parent_project_name)
+        self.movie_dir = os.path.join(parent_movie_dir, subproject_name)
 
-        if not os.path.isdir(parent_movie_dir):
-            os.mkdir(parent_movie_dir)
-        if not os.path.isdir(self.movie_dir):
-            os.mkdir(self.movie_dir)
+        if include_output:
+            if not os.path.isdir(parent_movie_dir):
+                os.mkdir(parent_movie_dir)
+            if not os.path.isdir(self.movie_dir):
+                os.mkdir(self.movie_dir)
 
-        self.slide_file = f'{self.source_dir}/{subproject_name}.pptx'
-        self.video_file = f'{self.movie_dir}/{final_filename}.mp4'
+        self.slide_file = os.path.join(self.source_dir, f'{subproject_name}.pptx')
+        self.video_file = os.path.join(self.movie_dir, f'{final_filename}.mp4')
 
     def build_all(self):
         """
@@ -338,6 +552,9 @@ class Movie():
             logger.error(f'{self.md_file} does not exist.')
             sys.exit(1)
 
+        # Parse the Markdown afresh once per run; stages then share the result
+        self._md_cache = None
+
         # 1. Generate narration audio from Markdown notes
         self.build_slide_audio()
         # 2. Generate slide images from PPTX
@@ -351,72 +568,159 @@ class Movie():
         """
         Synthesizes audio (TTS) from Markdown notes and saves as WAV files.
         Skips slides that have a pre-defined video file.
+        Up to `self.tts_concurrency` TTS requests are sent in parallel.
         """
         self._ensure_slide_ids()
-        state = self._load_audio_state()
-        slides_list = self._extract_slides_list()
-
-        # 1. Sync metadata and sort
-        self._sync_slide_metadata(state, slides_list)
-
-        # 2. Audio generation loop
-        for slide in slides_list:
-            slide_id = slide["id"]
-
-            # Skip TTS if a video file is specified
-            if slide.get("video_file"):
-                if self.show_skip:
-                    logger.info(
-                        f"[SKIP] {slide_id} (Movie Mode: {slide['video_file']})")
-                continue
-
-            raw_notes = slide["notes"]
+        with self._state_session() as state:
+            slides_list = self._extract_slides_list()
+            movie_files = self._list_movie_dir()
+
+            # 1. Sync metadata and sort
+            self._sync_slide_metadata(state, slides_list)
+
+            # 2. Collect slides whose audio must be regenerated
+            # (slide_id, normalized notes, notes hash, raw notes hash, wav_path,
+            #  additional_prompt, use_cache)
+            to_regen = []
+            slides_state = state["slides"]
+            show_skip = self.show_skip
+            tts_config_hash = self._hash_tts_config()
+
+            for slide in slides_list:
+                slide_id = slide["id"]
+
+                # Skip TTS if a video file is specified
+                if slide.get("video_file"):
+                    if show_skip:
+                        logger.info(
+                            f"[SKIP] {slide_id} (Movie Mode: {slide['video_file']})")
+                    continue
 
-            norm = self._normalize_notes(raw_notes)
-            current_notes_hash = self._hash_notes(norm)
+                raw_notes = slide["notes"]
+                raw_notes_hash = self._hash_raw_notes(raw_notes)
 
-            slide_state = state["slides"][slide_id]
-            audio_state = slide_state["audio"]
+                slide_state = slides_state[slide_id]
+                audio_state = slide_state["audio"]
 
-            saved_notes_hash = slide_state.get("notes_hash")
-            audio_status = audio_state.get("status")
+                saved_notes_hash = slide_state.get("notes_hash")
+                audio_status = audio_state.get("status")
 
-            # Determine file path
-            wav_path = os.path.join(
-                self.movie_dir,
-                audio_state["wav_file"]
-            )
+                # Determine file path
+                wav_file = audio_state["wav_file"]
+                wav_path = os.path.join(self.movie_dir, wav_file)
+                wav_exists = self._in_movie_dir(movie_files, wav_file)
 
-            # Regeneration check (Status mismatch OR Hash mismatch OR File
-            # missing)
-            if (audio_status != "generated" or
-                saved_notes_hash != current_notes_hash or
-                    not os.path.isfile(wav_path)):
+                # Fast path: raw notes unchanged since the audio was generated,
+                # so the normalized notes are unchanged too
+                if (audio_status == "generated" and wav_exists and saved_notes_hash and
+                        slide_state.get("raw_notes_hash") == raw_notes_hash):
+                    if show_skip:
+                        logger.info(f"[SKIP] {slide_id} (Audio: Unchanged)")
+                    continue
 
-                logger.info(f"[TTS] regenerate {slide_id}")
+                norm = self._normalize_notes(raw_notes)
+                current_notes_hash = self._hash_notes(norm)
 
-                add_prompt = audio_state.get("additional_prompt", "")
-                if norm == "":
-                    logger.error(
-                        f'Error: "::: notes" not found in {slide_id}.')
-                    sys.exit()
-                self._speak_to_wav(
-                    norm, wav_path, additional_prompt=add_prompt)
-                self.prepend_silence(wav_path)
-                duration = self._get_wav_duration(wav_path)
+                # Regeneration check (Status mismatch OR Hash mismatch OR File
+                # missing)
+                if (audio_status != "generated" or
+                    saved_notes_hash != current_notes_hash or
+                        not wav_exists):
 
-                slide_state["notes_hash"] = current_notes_hash
-                slide_state["notes_length"] = len(norm)
+                    add_prompt = audio_state.get("additional_prompt", "")
+                    if norm == "":
+                        logger.error(
+                            f'Error: "::: notes" not found in {slide_id}.')
+                        sys.exit()
+                    # The TTS cache is only consulted for changed notes, so forcing
+                    # regeneration via status.json still gets a fresh take
+                    use_cache = saved_notes_hash != current_notes_hash
+                    to_regen.append(
+                        (slide_id, norm, current_notes_hash, raw_notes_hash,
+                         wav_path, add_prompt, use_cache))
+                else:
+                    # Only whitespace changed: remember the new raw notes
+                    slide_state["raw_notes_hash"] = raw_notes_hash
+                    self._mark_state_dirty(state)
+                    if show_skip:
+                        logger.info(f"[SKIP] {slide_id} (Audio: Unchanged)")
 
-                audio_state["status"] = "generated"
-                audio_state["generated_at"] = self._now()
-                audio_state["duration_sec"] = duration
+            if not to_regen:
+                return
 
-                state["last_checked"] = self._now()
-                self._save_audio_state(state)
-            else:
-                if self.show_skip:
-                    logger.info(f"[SKIP] {slide_id} (Audio: Unchanged)")
+            # 3. Synthesize in parallel (TTS is network-bound); post-process and
+            # update state on the main thread as each request completes
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, self.tts_concurrency)) as executor:
+                    futures = {}
+                    for (slide_id, norm, notes_hash, raw_notes_hash,
+                            wav_path, add_prompt, use_cache) in to_regen:
+                        logger.info(f"[TTS] regenerate {slide_id}")
+                        future = executor.submit(
+                            self._speak_to_wav, norm, wav_path,
+                            additional_prompt=add_prompt, use_cache=use_cache)
+                        futures[future] = (
+                            slide_id, norm, notes_hash, raw_notes_hash, wav_path)
+
+                    def _finish(batch):
+                        # Prepend silence to the batch with one ffmpeg run, then record state
+                        self.prepend_silence_batch([item[4] for item in batch])
+                        for slide_id, norm, notes_hash, raw_notes_hash, wav_path in batch:
+                            duration = self._get_wav_duration(wav_path)
+
+                            slide_state = slides_state[slide_id]
+                            audio_state = slide_state["audio"]
+
+                            slide_state["notes_hash"] = notes_hash
+                            slide_state["raw_notes_hash"] = raw_notes_hash
+                            slide_state["notes_length"] = len(norm)
+
+                            audio_state["status"] = "generated"
+                            audio_state["generated_at"] = self._now()
+                            audio_state["duration_sec"] = duration
+                            audio_state["tts_config_hash"] = tts_config_hash
+
+                            state["last_checked"] = self._now()
+                            self._mark_state_dirty(state)
+
+                    # Synthesized slides waiting for post-processing
+                    pending = []
+                    # Futures already taken from as_completed()
+                    yielded = set()
+                    try:
+                        for future in as_completed(futures):
+                            yielded.add(future)
+                            future.result()
+                            pending.append(futures[future])
+                            if len(pending) >= _SILENCE_BATCH_SIZE:
+                                batch, pending = pending, []
+                                _finish(batch)
+                        if pending:
+                            batch, pending = pending, []
+                            _finish(batch)
+                    except BaseException:
+                        # Abort (e.g. TTS quota error): don't start queued requests,
+                        # and let the ones in flight finish
+                        for future in futures:
+                            future.cancel()
+                        executor.shutdown(wait=True)
+                        # Keep the audio that was already synthesized, including
+                        # requests that completed but were not yet yielded
+                        pending.extend(
+                            futures[f] for f in futures
+                            if f not in yielded and not f.cancelled()
+                            and f.exception() is None)
+                        if pending:
+                            batch, pending = pending, []
+                            _finish(batch)
+                        raise
+            finally:
+                # Save before pruning the cache, which can be slow: an error or
+                # interrupt there must not lose the audio state just recorded
+                self._flush_audio_state(state)
+
+            if self.tts_cache_enabled:
+                self._prune_tts_cache()
 
     def build_slide_images(self):
         """
@@ -428,236 +732,407 @@ class Movie():
             - External tool `pptxtoimages` (LibreOffice + Poppler) must be available.
         """
         from pptxtoimages.tools import PPTXToImageConverter
-        import glob
 
         if not os.path.isfile(self.slide_file):
             logger.error(f"Slide file does not exist: {self.slide_file}")
             return
 
         # 1. Change detection (Check PPTX hash)
-        state = self._load_audio_state()
-        current_pptx_hash = self._hash_file(self.slide_file)
+        with self._state_session() as state:
+            # Get existing state
+            images_task = state.get("images_task", {})
+
+            current_pptx_hash, current_pptx_fp = self._hash_file_with_fingerprint(
+                self.slide_file,
+                images_task.get("source_hash"),
+                images_task.get("source_fp")
+            )
 
-        # Get existing state
-        images_task = state.get("images_task", {})
+            if (images_task.get("status") == "generated" and
+                    images_task.get("source_hash") == current_pptx_hash):
+                if images_task.get("source_fp") != current_pptx_fp:
+                    # Content unchanged (e.g. file touched): remember new fingerprint
+                    images_task["source_fp"] = current_pptx_fp
+                    self._save_audio_state(state)
+                if self.show_skip:
+                    logger.info(f"[SKIP] Images (PPTX unchanged)")
+                return
 
-        if (images_task.get("status") == "generated" and
-                images_task.get("source_hash") == current_pptx_hash):
-            if self.show_skip:
-                logger.info(f"[SKIP] Images (PPTX unchanged)")
-            return
+            # --- Start Generation ---
 
-        # --- Start Generation ---
+            # Create output directory
+            os.makedirs(self.movie_dir, exist_ok=True)
 
-        # Create output directory
-        os.makedirs(self.movie_dir, exist_ok=True)
+            # Remove existing slide_*.png
+            for f in self._list_slide_images():
+                os.remove(f)
 
-        # Remove existing slide_*.png
-        for f in glob.glob(os.path.join(self.movie_dir, "slide_*.png")):
-            os.remove(f)
+            logger.info(f"Starting PPTX -> Image conversion.")
 
-        logger.info(f"Starting PPTX -> Image conversion.")
+            # PPTX -> PNG
+            converter = PPTXToImageConverter(self.slide_file, self.movie_dir)
+            converter.convert()
 
-        # PPTX -> PNG
-        converter = PPTXToImageConverter(self.slide_file, self.movie_dir)
-        converter.convert()
+            # Get generated filenames (slide_1.png, slide_2.png...)
+            generated_files = self._list_slide_images()
 
-        # Get generated filenames (slide_1.png, slide_2.png...)
-        generated_files = sorted(
-            glob.glob(os.path.join(self.movie_dir, "slide_*.png")),
-            key=lambda x: int(os.path.splitext(
-                os.path.basename(x))[0].split("_")[1])
-        )
+            # Get list of slide_ids
+            slide_ids = [s["id"] for s in self._extract_slides_list()]
 
-        # Get list of slide_ids
-        slide_notes = self._extract_slide_notes()
-        slide_ids = list(slide_notes.keys())
+            if len(slide_ids) != len(generated_files):
+                logger.warning(
+                    f"Generated image count ({len(generated_files)}) does not match slide_id count ({len(slide_ids)}).")
 
-        if len(slide_ids) != len(generated_files):
-            logger.warning(
-                f"Generated image count ({len(generated_files)}) does not match slide_id count ({len(slide_ids)}).")
+            # Rename using slide_id
+            for old_path, slide_id in zip(generated_files, slide_ids):
+                new_path = os.path.join(self.movie_dir, f"{slide_id}.png")
+                if old_path != new_path:
+                    os.replace(old_path, new_path)
 
-        # Rename using slide_id
-        for i, slide_id in enumerate(slide_ids):
-            if i >= len(generated_files):
-                break
-            old_path = generated_files[i]
-            new_path = os.path.join(self.movie_dir, f"{slide_id}.png")
-            os.rename(old_path, new_path)
-
-        # 2. Save state
-        state["images_task"] = {
-            "status": "generated",
-            "source_file": os.path.basename(self.slide_file),
-            "source_hash": current_pptx_hash,
-            "generated_at": self._now()
-        }
-        state["last_checked"] = self._now()
-        self._save_audio_state(state)
+            # 2. Save state
+            state["images_task"] = {
+                "status": "generated",
+                "source_file": os.path.basename(self.slide_file),
+                "source_hash": current_pptx_hash,
+                "source_fp": current_pptx_fp,
+                "generated_at": self._now()
+            }
+            state["last_checked"] = self._now()
+            self._save_audio_state(state)
+
+            logger.info(f"Image conversion completed.")
 
-        logger.info(f"Image conversion completed.")
+    def _list_slide_images(self):
+        """
+        Returns the paths of the `slide_<n>.png` files in `self.movie_dir`,
+        sorted by slide number.
+        """
+        images = []
+        with os.scandir(self.movie_dir) as it:
+            for entry in it:
+                m = _IMG_RE.fullmatch(entry.name)
+                if m:
+                    images.append((int(m.group(1)), entry.path))
+        images.sort()
+        return [path for _, path in images]
 
     def build_slide_videos(self):
         """
         Generates individual video files for each slide.
         - Normal slide: Image (PNG) + Audio (WAV) -> MP4
         - Video slide: Source Video (MP4) -> Resize & Padding -> MP4
+
+        Skip checks run serially; the remaining encodes run in parallel
+        (see `_get_ffmpeg_workers()`), and state is updated as each one finishes.
         """
         import subprocess
 
         width, height = self.screen_size
-        state = self._load_audio_state()
-        slides_list = self._extract_slides_list()
-        self._sync_slide_metadata(state, slides_list)
-
-        # Generation loop
-        for slide in slides_list:
-            slide_id = slide["id"]
-            video_file_src = slide.get("video_file")
-
-            output_mp4 = os.path.join(self.movie_dir, f"{slide_id}.mp4")
-
-            # Get state
-            if slide_id not in state["slides"]:
-                state["slides"][slide_id] = self._init_slide_state(slide_id)
-
-            slide_state = state["slides"][slide_id]
+        with self._state_session() as state:
+            slides_list = self._extract_slides_list()
+            self._sync_slide_metadata(state, slides_list)
+            movie_files = self._list_movie_dir()
+            # Clips encoded with other encoder settings are rebuilt, so that
+            # all clips stay compatible for concatenation
+            encoder = self._get_encoder_config()
+
+            # Encode jobs: (slide_id, cmd, output_mp4, video_state, error_message)
+            jobs = []
+            # Set when a skipped slide only needs its stored fingerprints refreshed
+            fp_updated = False
+            slides_state = state["slides"]
+            show_skip = self.show_skip
+
+            # Collect slides that need (re)generation
+            for slide, paths in zip(slides_list, self._get_slide_paths(slides_list)):
+                slide_id = slide["id"]
+                video_file_src = slide.get("video_file")
+
+                output_mp4 = paths.mp4
+
+                # Get state
+                slide_state = slides_state.get(slide_id)
+                if slide_state is None:
+                    slide_state = slides_state[slide_id] = self._init_slide_state(slide_id)
+
+                # --- Branch: If video file is specified ---
+                if video_file_src:
+                    src_path = os.path.join(self.movie_dir, video_file_src)
+
+                    if not self._in_movie_dir(movie_files, video_file_src):
+                        logger.error(
+                            f"Original video not found: {src_path} (Slide: {slide_id})")
+                        continue
 
-            # --- Branch: If video file is specified ---
-            if video_file_src:
-                src_path = os.path.join(self.movie_dir, video_file_src)
+                    # Check state
+                    video_state = slide_state["video"]
 
-                if not os.path.isfile(src_path):
-                    logger.error(
-                        f"Original video not found: {src_path} (Slide: {slide_id})")
-                    continue
+                    # Calculate hash (reused from state if the fingerprint matches)
+                    current_src_hash, current_src_fp = self._hash_file_with_fingerprint(
+                        src_path,
+                        video_state.get("source_hash"),
+                        video_state.get("source_fp")
+                    )
 
-                # Calculate hash
-                current_src_hash = self._hash_file(src_path)
+                    # Regeneration check
+                    if (video_state.get("status") == "generated" and
+                        video_state.get("encoder") == encoder and
+                        video_state.get("source_hash") == current_src_hash and
+                            f"{slide_id}.mp4" in movie_files):
+                        if video_state.get("source_fp") != current_src_fp:
+                            video_state["source_fp"] = current_src_fp
+                            fp_updated = True
+                        if show_skip:
+                            logger.info(
+                                f"[SKIP] {slide_id} (Video: unchanged/Source:{video_file_src})")
+                        continue
 
-                # Check state
-                video_state = slide_state["video"]
+                    logger.info(
+                        f"Converting video: {video_file_src} -> {slide_id}.mp4")
+
+                    # FFmpeg command: Resize + Audio re-encode
+                    cmd = [
+                        "ffmpeg", "-y",
+                        "-v", self.ffmpeg_loglevel,
+                        "-i", src_path,
+                        "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+                        *self._get_slide_encode_args(),
+                        output_mp4
+                    ]
+
+                    jobs.append((slide_id, cmd, output_mp4, {
+                        "status": "generated",
+                        "source_video": video_file_src,
+                        "source_hash": current_src_hash,
+                        "source_fp": current_src_fp,
+                        "encoder": encoder
+                    }, f"Video conversion failed: {slide_id}"))
 
-                # Regeneration check
-                if (video_state.get("status") == "generated" and
-                    video_state.get("source_hash") == current_src_hash and
-                        os.path.isfile(output_mp4)):
-                    if self.show_skip:
-                        logger.info(
-                            f"[SKIP] {slide_id} (Video: unchanged/Source:{video_file_src})")
-                    continue
+                # --- Branch: Normal slide (TTS + Image) ---
+                else:
+                    png_file = paths.png
+                    wav_file = paths.wav
 
-                logger.info(
-                    f"Converting video: {video_file_src} -> {slide_id}.mp4")
-
-                # FFmpeg command: Resize + Audio re-encode
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-v", self.ffmpeg_loglevel,
-                    "-i", src_path,
-                    "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-
-                    # --- Video settings ---
-                    "-c:v", self.video_codec,
-                    "-pix_fmt", self.video_pix_fmt,
-                    "-r", str(self.video_fps),
-                    "-video_track_timescale", str(self.video_timescale),
-
-                    # --- Audio settings ---
-                    "-c:a", self.audio_codec,
-                    "-ar", str(self.sample_rate),
-                    "-ac", str(self.audio_channels),
-                    "-b:a", self.audio_bitrate,
-                    output_mp4
-                ]
+                    if (f"{slide_id}.png" not in movie_files or
+                            f"{slide_id}.wav" not in movie_files):
+                        # Skip if assets are missing
+                        logger.warning(f"Material missing, skipping: {slide_id}")
+                        continue
 
-                try:
-                    subprocess.run(cmd, check=True)
-                    duration = self._get_mp4_duration(output_mp4)
+                    video_state = slide_state["video"]
+
+                    current_png_hash, current_png_fp = self._hash_file_with_fingerprint(
+                        png_file, video_state.get("png_hash"), video_state.get("png_fp"))
+                    current_wav_hash, current_wav_fp = self._hash_file_with_fingerprint(
+                        wav_file, video_state.get("wav_hash"), video_state.get("wav_fp"))
+
+                    if (video_state.get("status") == "generated" and
+                        video_state.get("encoder") == encoder and
+                        video_state.get("wav_hash") == current_wav_hash and
+                        video_state.get("png_hash") == current_png_hash and
+                            f"{slide_id}.mp4" in movie_files):
+                        if (video_state.get("png_fp") != current_png_fp or
+                                video_state.get("wav_fp") != current_wav_fp):
+                            video_state["png_fp"] = current_png_fp
+                            video_state["wav_fp"] = current_wav_fp
+                            fp_updated = True
+                        if show_skip:
+                            logger.info(f"[SKIP] {slide_id} (Video: unchanged)")
+                        continue
 
-                    # Update state
-                    slide_state["video"] = {
+                    # Generate video from still image
+                    cmd = [
+                        "ffmpeg", "-y",
+                        "-v", self.ffmpeg_loglevel,
+                        "-loop", "1",
+                        "-i", png_file,
+                        "-i", wav_file,
+                        "-tune", "stillimage",
+                        "-vf", f"scale={width}:{height}",
+                        *self._get_slide_encode_args(),
+                        "-shortest",
+                        output_mp4
+                    ]
+
+                    logger.info(f"Generating {slide_id}.mp4...")
+                    jobs.append((slide_id, cmd, output_mp4, {
                         "status": "generated",
-                        "source_video": video_file_src,
-                        "source_hash": current_src_hash,
-                        "duration_sec": duration,
-                        "generated_at": self._now()
-                    }
-                    state["last_checked"] = self._now()
-                    self._save_audio_state(state)
-                    logger.info(f"Done: {output_mp4} ({duration:.2f}s)")
+                        "wav_hash": current_wav_hash,
+                        "png_hash": current_png_hash,
+                        "wav_fp": current_wav_fp,
+                        "png_fp": current_png_fp,
+                        "encoder": encoder
+                    }, f"MP4 creation failed: {slide_id}"))
 
-                except subprocess.CalledProcessError:
-                    logger.error(f"Video conversion failed: {slide_id}")
+            if fp_updated:
+                self._mark_state_dirty(state)
 
-            # --- Branch: Normal slide (TTS + Image) ---
-            else:
-                png_file = os.path.join(self.movie_dir, f"{slide_id}.png")
-                wav_file = os.path.join(self.movie_dir, f"{slide_id}.wav")
+            if not jobs:
+                return
 
-                if not os.path.isfile(
-                        png_file) or not os.path.isfile(wav_file):
-                    # Skip if assets are missing
-                    logger.warning(f"Material missing, skipping: {slide_id}")
-                    continue
+            # Run encodes in parallel; update state on the main thread
+            with ThreadPoolExecutor(max_workers=self._get_ffmpeg_workers()) as executor:
+                futures = {
+                    executor.submit(self._run_ffmpeg, job[1]): job for job in jobs
+                }
+                for future in as_completed(futures):
+                    slide_id, _, output_mp4, video_state, error_message = futures[future]
+                    try:
+                        result = future.result()
+                        # Duration from ffmpeg's progress report; probe only if missing
+                        duration = self._parse_ffmpeg_progress(result.stdout)
+                        if duration is None:
+                            duration = self._get_mp4_duration(output_mp4)
+
+                        # Update state
+                        video_state["duration_sec"] = duration
+                        video_state["generated_at"] = self._now()
+                        slides_state[slide_id]["video"] = video_state
+                        state["last_checked"] = self._now()
+                        self._mark_state_dirty(state)
+                        logger.info(f"Done: {output_mp4} ({duration:.2f}s)")
+
+                    except subprocess.CalledProcessError as e:
+                        logger.error(error_message)
+                        if e.stderr:
+                            logger.error(e.stderr.strip())
+
+    def _get_slide_paths(self, slides_list):
+        """
+        Returns a `_SlidePaths` (id, png, wav, mp4) for each slide in `slides_list`.
+        The list is built once and reused while `slides_list` and `self.movie_dir`
+        are unchanged (the slide list itself is cached, see `_parse_markdown()`).
+        """
+        cached = self._slide_paths
+        if cached is not None and cached[0] is slides_list and cached[1] == self.movie_dir:
+            return cached[2]
+
+        join = os.path.join
+        movie_dir = self.movie_dir
+        paths = [
+            _SlidePaths(
+                s["id"],
+                join(movie_dir, f'{s["id"]}.png'),
+                join(movie_dir, f'{s["id"]}.wav'),
+                join(movie_dir, f'{s["id"]}.mp4'),
+            )
+            for s in slides_list
+        ]
+        self._slide_paths = (slides_list, movie_dir, paths)
+        return paths
 
-                current_png_hash = self._hash_file(png_file)
-                current_wav_hash = self._hash_file(wav_file)
+    def _list_movie_dir(self):
+        """
+        Returns the names of the regular files in `self.movie_dir`.
+        One directory scan replaces a stat call per file in the per-slide loops.
+        """
+        try:
+            with os.scandir(self.movie_dir) as it:
+                return {entry.name for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            return set()
+
+    def _in_movie_dir(self, movie_files, name):
+        """
+        Checks whether `name` (relative to `self.movie_dir`) is an existing file,
+        using the `_list_movie_dir()` snapshot for names without a directory part.
+        """
+        if os.sep in name or (os.altsep and os.altsep in name):
+            return os.path.isfile(os.path.join(self.movie_dir, name))
+        return name in movie_files
+
+    def _get_slide_encode_args(self):
+        """
+        Returns the ffmpeg output options shared by every per-slide MP4.
+
+        All slide clips must have identical stream parameters so that
+        `build_final_video()` can join them with the concat demuxer and `-c copy`.
+        Keeping them in one place prevents the two branches from drifting apart;
+        `-g` gives every clip the same keyframe interval (one per second).
+        """
+        x264_args = []
+        if self.video_codec == "libx264":
+            fps = self.video_fps
+            x264_args = [
+                "-preset", self.x264_preset,
+                "-crf", str(self.video_crf),
+                # Fixed GOP: no extra keyframes on scene cuts
+                "-x264-params", f"keyint={fps}:min-keyint={fps}:scenecut=0",
+            ]
+
+        return [
+            # --- Video settings ---
+            "-c:v", self.video_codec,
+            "-threads", str(self.ffmpeg_threads),
+            *x264_args,
+            "-pix_fmt", self.video_pix_fmt,
+            "-r", str(self.video_fps),
+            "-g", str(self.video_fps),
+            "-video_track_timescale", str(self.video_timescale),
+
+            # --- Audio settings ---
+            "-c:a", self.audio_codec,
+            "-ar", str(self.sample_rate),
+            "-ac", str(self.audio_channels),
+            "-b:a", self.audio_bitrate,
+        ]
 
-                video_state = slide_state["video"]
+    def _get_encoder_config(self):
+        """
+        Returns the encoder settings recorded with each slide video.
+        """
+        if self.video_codec == "libx264":
+            return {"preset": self.x264_preset, "crf": self.video_crf}
+        return {}
 
-                if (video_state.get("status") == "generated" and
-                    video_state.get("wav_hash") == current_wav_hash and
-                    video_state.get("png_hash") == current_png_hash and
-                        os.path.isfile(output_mp4)):
-                    if self.show_skip:
-                        logger.info(f"[SKIP] {slide_id} (Video: unchanged)")
-                    continue
+    def _get_ffmpeg_workers(self):
+        """
+        Returns the number of ffmpeg encodes to run in parallel.
+        Each encode uses `self.ffmpeg_threads` threads, so the CPU count is divided by it.
+        """
+        return max(1, (os.cpu_count() or 1) // max(1, self.ffmpeg_threads))
 
-                # Generate video from still image
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-v", self.ffmpeg_loglevel,
-                    "-loop", "1",
-                    "-i", png_file,
-                    "-i", wav_file,
-
-                    # --- Video settings ---
-                    "-c:v", self.video_codec,
-                    "-tune", "stillimage",
-                    "-pix_fmt", self.video_pix_fmt,
-                    "-r", str(self.video_fps),
-                    "-video_track_timescale", str(self.video_timescale),
-                    "-vf", f"scale={width}:{height}",
-
-                    # --- Audio settings ---
-                    "-c:a", self.audio_codec,
-                    "-ar", str(self.sample_rate),
-                    "-ac", str(self.audio_channels),
-                    "-b:a", self.audio_bitrate,
-
-                    "-shortest",
-                    output_mp4
-                ]
-
-                logger.info(f"Generating {slide_id}.mp4...")
-                try:
-                    subprocess.run(cmd, check=True)
-                    duration = self._get_mp4_duration(output_mp4)
+    def _run_ffmpeg(self, cmd):
+        """
+        Runs an ffmpeg command without a terminal attached (safe for parallel use).
+        ffmpeg's log output is captured and logged at DEBUG after the process ends;
+        on failure it is attached to the raised error instead. Output is decoded as
+        UTF-8 with replacement, since ffmpeg prints paths and metadata as raw bytes.
+        A machine-readable progress report is requested on stdout
+        (see `_parse_ffmpeg_progress()`).
 
-                    slide_state["video"] = {
-                        "status": "generated",
-                        "wav_hash": current_wav_hash,
-                        "png_hash": current_png_hash,
-                        "duration_sec": duration,
-                        "generated_at": self._now()
-                    }
-                    state["last_checked"] = self._now()
-                    self._save_audio_state(state)
-                    logger.info(f"Done: {output_mp4} ({duration:.2f}s)")
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg fails (stderr is attached).
+        """
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+        result = subprocess.run(
+            cmd,
+            check=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+        )
+        if result.stderr:
+            logger.debug(result.stderr.strip())
+        return result
 
-                except subprocess.CalledProcessError:
-                    logger.error(f"MP4 creation failed: {slide_id}")
+    def _parse_ffmpeg_progress(self, output):
+        """
+        Returns the output duration (seconds) from ffmpeg's `-progress` report,
+        i.e. the last `out_time_us` value, or None if it is not available.
+        (`out_time_ms` is also in microseconds despite its name.)
+        """
+        duration = None
+        for line in (output or "").splitlines():
+            key, _, value = line.partition("=")
+            if key in ("out_time_us", "out_time_ms"):
+                try:
+                    duration = int(value) / 1000000.0
+                except ValueError:
+                    pass
+        return duration
 
     def build_final_video(self):
         """
@@ -672,88 +1147,85 @@ class Movie():
         """
         import subprocess
 
-        state = self._load_audio_state()
-
-        # Get correct order from Markdown
-        slides_list = self._extract_slides_list()
-        slide_ids = [s["id"] for s in slides_list]
+        with self._state_session() as state:
+            # Get correct order from Markdown
+            slides_list = self._extract_slides_list()
+            slide_ids = [s["id"] for s in slides_list]
 
-        if not slide_ids:
-            logger.error("No Slide IDs found.")
-            return
+            if not slide_ids:
+                logger.error("No Slide IDs found.")
+                return
 
-        # 1. Calculate source hash
-        current_source_hash = self._calculate_source_hash(slide_ids)
+            # 1. Calculate source hash
+            movie_files = self._list_movie_dir()
+            current_source_hash = self._calculate_source_hash(slide_ids, movie_files)
 
-        # 2. Skip check
-        final_movie_state = state.get("final_movie", {})
+            # 2. Skip check
+            final_movie_state = state.get("final_movie", {})
 
-        if (final_movie_state.get("status") == "generated" and
-            final_movie_state.get("source_hash") == current_source_hash and
-                os.path.isfile(self.video_file)):
-            if self.show_skip:
-                logger.info(f"[SKIP] Final Video (unchanged)")
-            return
+            if (final_movie_state.get("status") == "generated" and
+                final_movie_state.get("source_hash") == current_source_hash and
+                    os.path.isfile(self.video_file)):
+                if self.show_skip:
+                    logger.info(f"[SKIP] Final Video (unchanged)")
+                return
 
-        # 3. Create concatenation list
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            concat_list = f.name
-            found_count = 0
-            for slide_id in slide_ids:
-                mp4_path = os.path.join(self.movie_dir, f"{slide_id}.mp4")
-                if os.path.isfile(mp4_path):
-                    # ffmpeg concat demuxer format
+            # 3. Create concatenation list (ffmpeg concat demuxer format, sent on stdin)
+            concat_lines = []
+            for paths in self._get_slide_paths(slides_list):
+                if f"{paths.id}.mp4" in movie_files:
                     # Use abspath for Windows path compatibility
-                    f.write(f"file '{os.path.abspath(mp4_path)}'\n")
-                    found_count += 1
+                    concat_lines.append(f"file '{os.path.abspath(paths.mp4)}'\n")
                 else:
-                    logger.warning(f"MP4 not found: {mp4_path} (Skipping)")
-
-        if found_count == 0:
-            logger.error("No MP4s found for concatenation.")
-            os.remove(concat_list)
-            return
+                    logger.warning(f"MP4 not found: {paths.mp4} (Skipping)")
+            found_count = len(concat_lines)
 
-        logger.info("Starting final video concatenation...")
-
-        # 4. Run FFmpeg
-        cmd = [
-            "ffmpeg",
-            "-v", self.ffmpeg_loglevel,
-            "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", concat_list,
-            "-c", "copy",
-            self.video_file
-        ]
-
-        try:
-            subprocess.run(cmd, check=True)
+            if found_count == 0:
+                logger.error("No MP4s found for concatenation.")
+                return
 
-            # 5. Save results
-            duration_sec = self._get_mp4_duration(self.video_file)
+            logger.info("Starting final video concatenation...")
+
+            # 4. Run FFmpeg
+            cmd = [
+                "ffmpeg",
+                "-v", self.ffmpeg_loglevel,
+                "-y",
+                "-fflags", "+genpts",
+                "-f", "concat",
+                "-safe", "0",
+                "-protocol_whitelist", "file,pipe",
+                "-i", "pipe:0",
+                "-c", "copy",
+                # Put the index (moov) first so playback can start while downloading
+                "-movflags", "+faststart",
+                self.video_file
+            ]
 
-            state["final_movie"] = {
-                "status": "generated",
-                "file_name": os.path.basename(self.video_file),
-                "generated_at": self._now(),
-                "duration_min": duration_sec / 60.0,
-                "slides": found_count,
-                "source_hash": current_source_hash
-            }
+            try:
+                subprocess.run(
+                    cmd, input="".join(concat_lines).encode("utf-8"), check=True)
+
+                # 5. Save results
+                duration_sec = self._get_mp4_duration(self.video_file)
+
+                state["final_movie"] = {
+                    "status": "generated",
+                    "file_name": os.path.basename(self.video_file),
+                    "generated_at": self._now(),
+                    "duration_min": duration_sec / 60.0,
+                    "slides": found_count,
+                    "source_hash": current_source_hash
+                }
 
-            state["last_checked"] = self._now()
-            self._save_audio_state(state)
+                state["last_checked"] = self._now()
+                self._save_audio_state(state)
 
-            logger.info(
-                f"Final video created and saved: {self.video_file} ({duration_sec/60.0:.2f} min)")
+                logger.info(
+                    f"Final video created and saved: {self.video_file} ({duration_sec/60.0:.2f} min)")
 
-        except subprocess.CalledProcessError:
-            logger.error("MP4 concatenation failed.")
-        finally:
-            if os.path.exists(concat_list):
-                os.remove(concat_list)
+            except subprocess.CalledProcessError:
+                logger.error("MP4 concatenation failed.")
 
     def _get_build_config(self):
         """
@@ -789,8 +1261,6 @@ class Movie():
         Format:
             <!-- slide-id: {project_id}-{seq} -->
         """
-        import re
-
         # 1. Read current file content
         if not os.path.exists(self.md_file):
             return
@@ -798,14 +1268,19 @@ class Movie():
         with open(self.md_file, encoding="utf-8") as f:
             lines = f.readlines()
 
-        # 2. Extract existing slide-ids to prevent duplicates
+        # 2. Single pass: collect existing slide-ids (to prevent duplicates and
+        # find the max sequence) and note headers that lack an ID.
         # Pattern: <!-- slide-id: {project_id}-XX -->
-        id_pattern = re.compile(r'<!--\s*slide-id:\s*(.+?)\s*-->')
         existing_ids = set()
         max_seq = 0
+        prefix = f"{self.project_id}-"
+
+        new_lines = []
+        missing = []  # Indices in new_lines reserved for generated IDs
+        prev_is_id = False  # Whether the previous non-empty line was an ID
 
         for line in lines:
-            m = id_pattern.search(line)
+            m = _SLIDE_ID_RE.search(line)
             if m:
                 sid = m.group(1).strip()
 
@@ -816,59 +1291,47 @@ class Movie():
                 existing_ids.add(sid)
 
                 # Track max sequence number for auto-numbering
-                prefix = f"{self.project_id}-"
                 if sid.startswith(prefix):
-                    try:
-                        num_part = sid[len(prefix):]
-                        val = int(num_part)
-                        if val > max_seq:
-                            max_seq = val
-                    except ValueError:
-                        pass
-
-        # 3. Insert IDs for headers missing them
-        new_lines = []
+                    num_part = sid[len(prefix):]
+                    if num_part.isdecimal():
+                        max_seq = max(max_seq, int(num_part))
 
-        for i, line in enumerate(lines):
             stripped_line = line.strip()
 
-            # If it's a header line
-            if stripped_line.startswith("# "):
+            # Header line without an ID directly above it
+            if stripped_line.startswith("# ") and not prev_is_id:
+                missing.append(len(new_lines))
+                new_lines.append(None)
 
-                # Check if the previous non-empty line was an ID
-                has_id = False
-                check_index = len(new_lines) - 1
-                while check_index >= 0:
-                    prev = new_lines[check_index].strip()
-                    if prev == "":
-                        check_index -= 1
-                        continue
-                    if id_pattern.match(prev):
-                        has_id = True
-                    break
+            new_lines.append(line)
 
-                # If no ID, generate and insert one
-                if not has_id:
-                    while True:
-                        max_seq += 1
-                        new_id = f"{self.project_id}-{max_seq:02d}"
-                        if new_id not in existing_ids:
-                            existing_ids.add(new_id)
-                            break
+            if stripped_line:
+                # An ID at the start of the line (the search above finds the leftmost one)
+                prev_is_id = (m is not None and
+                              m.start() == len(line) - len(line.lstrip()))
 
-                    new_lines.append(f"<!-- slide-id: {new_id} -->\n")
+        if not missing:
+            return
 
-            new_lines.append(line)
+        # 3. Generate IDs (numbered after all existing ones) for the reserved lines
+        for index in missing:
+            while True:
+                max_seq += 1
+                new_id = f"{self.project_id}-{max_seq:02d}"
+                if new_id not in existing_ids:
+                    existing_ids.add(new_id)
+                    break
+            new_lines[index] = f"<!-- slide-id: {new_id} -->\n"
 
-        # 4. Write back if changes occurred
-        if new_lines != lines:
-            logger.info("Adding missing slide-ids...")
-            with open(self.md_file, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
+        # 4. Write back (atomically, so the Markdown is never truncated)
+        logger.info("Adding missing slide-ids...")
+        _atomic_write(self.md_file, lambda f: f.writelines(new_lines),
+                      encoding="utf-8")
 
     def _sync_slide_metadata(self, state, slides_list):
         """
         Syncs Markdown information (titles, order, video_files) with the JSON state.
+        Changes are saved when the surrounding `_state_session()` ends.
         """
         is_updated = False
 
@@ -913,59 +1376,46 @@ class Movie():
 
         if is_updated:
             state["last_checked"] = self._now()
-            self._save_audio_state(state)
+            self._state_pending += 1
             logger.info("Slide order and metadata updated.")
 
     def _extract_slide_notes(self):
         """
-        Parses the Markdown file to extract slide-ids and corresponding notes.
+        Returns the notes of each slide, in Markdown order.
         Exits if duplicate slide_ids are found.
 
         Returns:
             dict: {slide_id (str): notes_text (str)}
         """
-        slides = {}
-        current_id = None
-        in_notes = False
-        buffer = []
-
-        with open(self.md_file, encoding="utf-8") as f:
-            for line in f:
-                if line.startswith("<!-- slide-id:"):
-                    current_id = line.strip()[len(
-                        "<!-- slide-id:"): -3].strip()
-
-                    if current_id in slides:
-                        logger.error(
-                            f"Duplicate slide_id detected: {current_id}")
-                        sys.exit(1)
-
-                    slides[current_id] = ""
-                    continue
-
-                if line.strip() == "::: notes":
-                    in_notes = True
-                    buffer = []
-                    continue
-
-                if line.strip() == ":::" and in_notes:
-                    slides[current_id] = "".join(buffer).strip()
-                    in_notes = False
-                    continue
-
-                if in_notes:
-                    buffer.append(line)
-
-        return slides
+        return {s["id"]: s["notes"] for s in self._parse_markdown()}
 
     def _extract_slides_list(self):
         """
-        Parses Markdown to extract a list of slides containing:
+        Returns the list of slides containing:
         slide-id, video-file, title, and notes.
         Exits on duplicate slide_ids.
+
+        The list is shared (see `_parse_markdown()`); callers must not modify it.
         """
+        return self._parse_markdown()
+
+    def _parse_markdown(self):
+        """
+        Parses the Markdown file in a single pass into a list of slides:
+        {"id", "title", "video_file", "notes"}. Exits on duplicate slide_ids.
+
+        All slide queries (`_extract_slides_list()`, `_extract_slide_notes()`,
+        `write_video_length_csv()`) use this result. It is reused while the Markdown
+        file is unchanged (same path, mtime and size); `build_all()` resets it at
+        the start of each run.
+        """
+        st = os.stat(self.md_file)
+        key = (self.md_file, st.st_mtime_ns, st.st_size)
+        if self._md_cache is not None and self._md_cache[0] == key:
+            return self._md_cache[1]
+
         slides = []
-        seen_ids = set()
+        slide_ids = []
 
         current_data = {
             "id": None,
@@ -977,7 +1427,7 @@ class Movie():
 
         def _save_current(data):
             if data["id"]:
-                notes_text = "".join(data["notes_buffer"]).strip()
+                notes_text = "\n".join(data["notes_buffer"]).strip()
                 slides.append({
                     "id": data["id"],
                     "title": data["title"],
@@ -985,62 +1435,83 @@ class Movie():
                     "notes": notes_text
                 })
 
+        # Read the whole file and split it in one call instead of iterating the
+        # file object line by line; lines are kept without their "\n"
         with open(self.md_file, encoding="utf-8") as f:
-            for line in f:
-                stripped = line.strip()
+            lines = f.read().split("\n")
 
-                # slide-id
-                if line.startswith("<!-- slide-id:"):
-                    _save_current(current_data)
-                    new_id = line.strip()[len("<!-- slide-id:"): -3].strip()
-
-                    if new_id in seen_ids:
-                        logger.error(f"Duplicate slide_id detected: {new_id}")
-                        sys.exit(1)
-                    seen_ids.add(new_id)
-
-                    current_data = {
-                        "id": new_id,
-                        "title": "",
-                        "video_file": None,
-                        "notes_buffer": [],
-                        "in_notes": False
-                    }
-                    continue
+        marker_match = _MARKER_RE.match
+        for line in lines:
+            m = marker_match(line)
+            if m is None:
+                # Plain line: the common case
+                if current_data["in_notes"]:
+                    current_data["notes_buffer"].append(line)
+                continue
+            kind = m.lastindex
+
+            # slide-id
+            if kind == _MARKER_SLIDE_ID:
+                _save_current(current_data)
+                new_id = line.strip()[_SLIDE_ID_PREFIX_LEN:-3].strip()
+                slide_ids.append(new_id)
+
+                current_data = {
+                    "id": new_id,
+                    "title": "",
+                    "video_file": None,
+                    "notes_buffer": [],
+                    "in_notes": False
+                }
+                continue
 
-                # video-file
-                if line.startswith("<!-- video-file:"):
-                    v_file = line.strip()[len("<!-- video-file:"): -3].strip()
-                    current_data["video_file"] = v_file
-                    continue
+            # video-file
+            if kind == _MARKER_VIDEO_FILE:
+                v_file = line.strip()[_VIDEO_FILE_PREFIX_LEN:-3].strip()
+                current_data["video_file"] = v_file
+                continue
 
-                # Title
-                if (current_data["id"] and not current_data["title"]
-                        and line.startswith("# ") and not line.startswith("##")):
-                    current_data["title"] = line[2:].strip()
-                    continue
+            # Title
+            if (kind == _MARKER_TITLE and current_data["id"]
+                    and not current_data["title"]):
+                current_data["title"] = line[2:].strip()
+                continue
 
-                # notes block
-                if stripped == "::: notes":
+            # notes block
+            if kind == _MARKER_NOTES:
+                if m.group(kind) == _NOTES_OPEN:
                     current_data["in_notes"] = True
                     current_data["notes_buffer"] = []
                     continue
 
-                if stripped == ":::" and current_data["in_notes"]:
+                if current_data["in_notes"]:
                     current_data["in_notes"] = False
                     continue
 
-                if current_data["in_notes"]:
-                    current_data["notes_buffer"].append(line)
+            if current_data["in_notes"]:
+                current_data["notes_buffer"].append(line)
 
-            _save_current(current_data)
+        _save_current(current_data)
 
+        # Checked once after parsing; the loop only runs when there is a duplicate
+        if len(slide_ids) != len(set(slide_ids)):
+            seen_ids = set()
+            for slide_id in slide_ids:
+                if slide_id in seen_ids:
+                    logger.error(f"Duplicate slide_id detected: {slide_id}")
+                    sys.exit(1)
+                seen_ids.add(slide_id)
+
+        self._md_cache = (key, slides)
         return slides
 
     def _load_audio_state(self):
         """
         Loads the audio generation state file (JSON).
 
+        Migrations and accepted config changes are recorded as pending and saved
+        when the surrounding `_state_session()` ends.
+
         Validation:
         1. build_config: If inconsistent with current settings (e.g., resolution change), exits with error.
         2. tts_config: If inconsistent, prompts the user to continue or abort.
@@ -1048,8 +1519,7 @@ class Movie():
         if not os.path.isfile(self.status_file):
             return self._init_audio_state(self.status_file)
 
-        with open(self.status_file, encoding="utf-8") as f:
-            state = json.load(f)
+        state = _read_json_file(self.status_file)
 
         # --- build_config check ---
         stored_config = state.get("build_config")
@@ -1059,7 +1529,7 @@ class Movie():
             logger.info(
                 "No build_config in state file. Applying current settings.")
             state["build_config"] = current_config
-            self._save_audio_state(state)
+            self._state_pending += 1
             stored_config = current_config
 
         if stored_config != current_config:
@@ -1085,7 +1555,7 @@ class Movie():
             logger.info(
                 "No TTS config in state file. Applying current settings.")
             state["tts_config"] = current_tts
-            self._save_audio_state(state)
+            self._state_pending += 1
 
         # Confirmation prompt if mismatched
         elif stored_tts != current_tts:
@@ -1109,7 +1579,7 @@ class Movie():
                     logger.info(
                         "Applying new settings and continuing. Updating state file.")
                     state["tts_config"] = current_tts
-                    self._save_audio_state(state)
+                    self._state_pending += 1
                     break
                 elif choice == '2':
                     logger.info("Aborted by user.")
@@ -1121,19 +1591,56 @@ class Movie():
 
     def _save_audio_state(self, state):
         """
-        Saves the audio generation state to the JSON file.
+        Saves the audio generation state to the JSON file (atomically).
         Sorts slides by `slide_index` before saving to ensure order in the file.
         """
         if "slides" in state:
-            # Sort dictionary by slide_index
-            sorted_slides = dict(sorted(
-                state["slides"].items(),
-                key=lambda item: item[1].get("slide_index", 999999)
-            ))
-            state["slides"] = sorted_slides
+            # Sort dictionary by slide_index (in place, so that references to
+            # state["slides"] held by the build loops stay valid)
+            # Skipped when the slides are already in order, which is the usual case
+            slides = state["slides"]
+            indices = [v.get("slide_index", 999999) for v in slides.values()]
+            if any(a > b for a, b in zip(indices, indices[1:])):
+                sorted_items = sorted(
+                    slides.items(),
+                    key=lambda item: item[1].get("slide_index", 999999)
+                )
+                slides.clear()
+                slides.update(sorted_items)
 
-        with open(self.status_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        # Write atomically, so an interrupted write never leaves a truncated status file
+        data = _dumps_json(state)
+        _atomic_write(self.status_file, lambda f: f.write(data), 'wb')
+        self._state_pending = 0
+
+    @contextmanager
+    def _state_session(self):
+        """
+        Loads the state and yields it; on exit, saves it once if anything
+        (loading, metadata sync or a build loop) left changes unsaved.
+        """
+        state = self._load_audio_state()
+        try:
+            yield state
+        finally:
+            self._flush_audio_state(state)
+
+    def _mark_state_dirty(self, state):
+        """
+        Records a state change from a per-slide build loop.
+        The state file is written every `_STATE_SAVE_INTERVAL` changes instead of
+        after each slide; `_state_session()` saves the rest on exit.
+        """
+        self._state_pending += 1
+        if self._state_pending >= _STATE_SAVE_INTERVAL:
+            self._save_audio_state(state)
+
+    def _flush_audio_state(self, state):
+        """
+        Saves the state file if there are changes not yet written.
+        """
+        if self._state_pending:
+            self._save_audio_state(state)
 
     def _init_audio_state(self, path):
         """
@@ -1178,12 +1685,27 @@ class Movie():
             "prompt": self.prompt
         }
 
+    def _hash_tts_config(self):
+        """
+        Calculates a hash of the current TTS configuration (see `_get_tts_config()`),
+        recorded with each generated audio file.
+        """
+        config = json.dumps(self._get_tts_config(), sort_keys=True, ensure_ascii=False)
+        return self._hash_notes(config)
+
     def _get_wav_duration(self, wav_path):
         """
         Gets the duration (seconds) of a WAV file.
+        The header is parsed directly; the `wave` module is the fallback.
         """
         if not os.path.isfile(wav_path):
             return 0.0
+        try:
+            duration = _read_wav_duration(wav_path)
+            if duration is not None:
+                return duration
+        except (OSError, struct.error):
+            pass
         try:
             with wave.open(wav_path, 'rb') as f:
                 frames = f.getnframes()
@@ -1223,6 +1745,56 @@ class Movie():
 
         os.replace(tmp.name, wav_file)
 
+    def prepend_silence_batch(self, wav_files):
+        """
+        Inserts a silence period at the beginning of each of the specified WAV files,
+        using a single ffmpeg process for all of them.
+        The duration is defined by `self.silence_sec`.
+
+        Args:
+            wav_files (list): Paths to the target WAV files.
+        """
+        if len(wav_files) <= 1:
+            for wav_file in wav_files:
+                self.prepend_silence(wav_file)
+            return
+
+        n = len(wav_files)
+        cmd = [
+            "ffmpeg", "-y",
+            "-v", self.ffmpeg_loglevel,
+            "-f", "lavfi",
+            "-t", str(self.silence_sec),
+            "-i", f"anullsrc=r={self.sample_rate}:cl=mono",
+        ]
+        for wav_file in wav_files:
+            cmd += ["-i", wav_file]
+
+        # One silence source split n ways, each joined with one WAV
+        filters = ["[0:a]asplit=" + str(n) + "".join(f"[s{i}]" for i in range(1, n + 1))]
+        filters += [f"[s{i}][{i}:a]concat=n=2:v=0:a=1[o{i}]" for i in range(1, n + 1)]
+        cmd += ["-filter_complex", ";".join(filters)]
+
+        tmp_files = []
+        try:
+            for i, wav_file in enumerate(wav_files, 1):
+                tmp = tempfile.NamedTemporaryFile(
+                    suffix=".wav", delete=False, dir=os.path.dirname(wav_file)
+                )
+                tmp.close()
+                tmp_files.append(tmp.name)
+                cmd += ["-map", f"[o{i}]", tmp.name]
+
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+
+            for tmp_name, wav_file in zip(tmp_files, wav_files):
+                os.replace(tmp_name, wav_file)
+        finally:
+            for tmp_name in tmp_files:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+
     def build_slide_pptx(self):
         """
         Generates a PowerPoint file (.pptx) from Markdown using Pandoc.
@@ -1236,48 +1808,50 @@ class Movie():
             return
 
         # 1. Change detection
-        state = self._load_audio_state()
-        current_md_hash = self._hash_file(self.md_file)
+        with self._state_session() as state:
+            current_md_hash = self._hash_file(self.md_file)
 
-        pptx_task = state.get("pptx_task", {})
+            pptx_task = state.get("pptx_task", {})
 
-        # Skip if PPTX exists and hash matches
-        if (pptx_task.get("status") == "generated" and
-            pptx_task.get("source_hash") == current_md_hash and
-                os.path.isfile(self.slide_file)):
+            # Skip if PPTX exists and hash matches
+            if (pptx_task.get("status") == "generated" and
+                pptx_task.get("source_hash") == current_md_hash and
+                    os.path.isfile(self.slide_file)):
 
-            logger.info(f"[SKIP] PPTX Create (Markdown unchanged)")
-            return
+                logger.info(f"[SKIP] PPTX Create (Markdown unchanged)")
+                return
 
-        # --- Start Generation ---
+            # --- Start Generation ---
 
-        command = (
-            f'pandoc {self.md_file} '
-            f'--slide-level=1 '
-            f'--resource-path={self.source_dir} '
-            f'-o {self.slide_file}'
-        )
+            # Run pandoc directly (no shell), so paths with spaces need no quoting
+            command = [
+                'pandoc', self.md_file,
+                '--slide-level=1',
+                f'--resource-path={self.source_dir}',
+                '-o', self.slide_file,
+            ]
 
-        logger.info(f'Starting Markdown -> PPTX conversion.')
+            logger.info(f'Starting Markdown -> PPTX conversion.')
 
-        try:
-            subprocess.check_call(command, shell=True)
-
-            # 2. Save state
-            state["pptx_task"] = {
-                "status": "generated",
-                "source_file": os.path.basename(self.md_file),
-                "source_hash": current_md_hash,
-                "generated_at": self._now()
-            }
-            state["last_checked"] = self._now()
-            self._save_audio_state(state)
+            try:
+                subprocess.run(command, check=True)
+
+                # 2. Save state
+                state["pptx_task"] = {
+                    "status": "generated",
+                    "source_file": os.path.basename(self.md_file),
+                    "source_hash": current_md_hash,
+                    "generated_at": self._now()
+                }
+                state["last_checked"] = self._now()
+                # Written together with any load-time changes when the session ends
+                self._mark_state_dirty(state)
 
-            logger.info(f"PPTX conversion completed and state saved.")
+                logger.info(f"PPTX conversion completed and state updated.")
 
-        except subprocess.CalledProcessError:
-            logger.error(f'PPTX conversion error')
-            sys.exit(0)
+            except subprocess.CalledProcessError:
+                logger.error(f'PPTX conversion error')
+                sys.exit(0)
 
     def _init_slide_state(self, slide_id):
         """
@@ -1287,45 +1861,50 @@ class Movie():
             "slide_index": None,
             "title": "",
             "notes_hash": None,
+            "raw_notes_hash": None,
             "notes_length": 0,
             "audio": {
                 "status": "missing",
                 "wav_file": f"{slide_id}.wav",
                 "generated_at": None,
                 "duration_sec": None,
+                "tts_config_hash": None,
                 "additional_prompt": ""
             }
         }
 
-    def _speak_to_wav(self, text, wav_path, additional_prompt=""):
+    def _speak_to_wav(self, text, wav_path, additional_prompt="", use_cache=True):
         """
         Synthesizes text to speech using the configured TTS client and saves as WAV.
+        If the TTS cache is enabled, successful results are stored in it.
 
         Args:
             text (str): Text to synthesize.
             wav_path (str): Output WAV file path.
             additional_prompt (str): Additional prompt for specific slides.
+            use_cache (bool): Whether a cached result may be used instead of calling the API.
         """
-        client = multiai_tts.Prompt()
-        if self.tts_provider == 'openai':
-            client.set_tts_model(self.tts_provider, self.tts_model)
-            client.tts_voice_openai = self.tts_voice
-        if self.tts_provider == 'google':
-            client.set_tts_model(self.tts_provider, self.tts_model)
-            client.tts_voice_google = self.tts_voice
-        if self.tts_provider == 'azure':
-            client.set_tts_provider(self.tts_provider)
-            client.tts_voice_azure = self.tts_voice
-
         if self.tts_use_prompt:
             full_prompt_text = f'{self.prompt}{additional_prompt}\n{text}'
         else:
             full_prompt_text = text
-        
+
+        cache_path = None
+        if self.tts_cache_enabled:
+            cache_path = self._get_tts_cache_path(full_prompt_text)
+            if use_cache and self._load_tts_cache(cache_path, wav_path):
+                logger.info(
+                    f"[TTS] cache hit: {os.path.basename(wav_path)}")
+                return
+
+        client = self._get_tts_client()
+
         for attempt in range(self.max_retry):
             client.save_tts(full_prompt_text, wav_path)
 
             if not client.error:
+                if cache_path:
+                    self._store_tts_cache(wav_path, cache_path)
                 return
 
             if attempt > 0 or 'RESOURCE_EXHAUSTED' in client.error_message:
@@ -1336,22 +1915,159 @@ class Movie():
                     f'{full_prompt_text}\n{client.error_message}\nWaiting for 3 minutes and retry...')
                 time.sleep(180)
 
+    def _get_tts_client(self):
+        """
+        Returns a TTS client configured with the current provider, model and voice.
+
+        A client keeps per-request error state, so each worker thread gets its own.
+        It is reused by later `_speak_to_wav()` calls on the same thread and rebuilt
+        if the TTS settings change.
+
+        HTTP connections are not shared here: `multiai_tts` creates the provider
+        SDK client (OpenAI, google-genai, Azure Speech) inside each `save_tts()`
+        call and exposes no session object, so there is nothing to inject.
+        """
+        signature = (self.tts_provider, self.tts_model, self.tts_voice)
+        local = self._tts_local
+        if getattr(local, "signature", None) == signature:
+            return local.client
+
+        client = multiai_tts.Prompt()
+        if self.tts_provider == 'openai':
+            client.set_tts_model(self.tts_provider, self.tts_model)
+            client.tts_voice_openai = self.tts_voice
+        if self.tts_provider == 'google':
+            client.set_tts_model(self.tts_provider, self.tts_model)
+            client.tts_voice_google = self.tts_voice
+        if self.tts_provider == 'azure':
+            client.set_tts_provider(self.tts_provider)
+            client.tts_voice_azure = self.tts_voice
+
+        local.client = client
+        local.signature = signature
+        return client
+
+    def _get_tts_cache_path(self, full_prompt_text):
+        """
+        Returns the TTS cache file for the given prompt text and the current
+        provider, model and voice.
+        """
+        key = json.dumps(
+            [self.tts_provider, self.tts_model, self.tts_voice, full_prompt_text],
+            ensure_ascii=False
+        ).encode("utf-8")
+        digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+        return os.path.join(os.path.expanduser(_TTS_CACHE_DIR), f"{digest}.wav")
+
+    def _load_tts_cache(self, cache_path, wav_path):
+        """
+        Copies a cached TTS result to `wav_path`.
+
+        Returns:
+            bool: True on a cache hit, False if no usable entry exists.
+        """
+        try:
+            self._copy_file_atomic(cache_path, wav_path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to read TTS cache {cache_path}: {e}")
+            return False
+
+        # Mark as recently used for `_prune_tts_cache()`
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return True
+
+    def _store_tts_cache(self, wav_path, cache_path):
+        """
+        Stores a freshly synthesized WAV file in the TTS cache.
+        The entry is a separate copy (not a hard link), since the TTS client
+        writes later audio for the same slide into `wav_path` in place.
+        """
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            self._copy_file_atomic(wav_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache {cache_path}: {e}")
+
+    def _copy_file_atomic(self, src, dst):
+        """
+        Copies `src` to a temporary file next to `dst`, then swaps it in with
+        `os.replace`. `dst` always ends up as a new file of its own, even if it
+        was a hard link to `src`.
+        """
+        tmp = tempfile.NamedTemporaryFile(
+            suffix=".tmp", delete=False, dir=os.path.dirname(dst) or "."
+        )
+        tmp.close()
+        try:
+            shutil.copyfile(src, tmp.name)
+            os.replace(tmp.name, dst)
+        except OSError:
+            os.remove(tmp.name)
+            raise
+
+    def _prune_tts_cache(self):
+        """
+        Removes the least recently used TTS cache files while the cache is
+        larger than `self.tts_cache_max_bytes`.
+        """
+        limit = self.tts_cache_max_bytes
+        if not limit:
+            return
+
+        cache_dir = os.path.expanduser(_TTS_CACHE_DIR)
+        entries = []
+        total = 0
+        try:
+            with os.scandir(cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".wav") and entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Failed to scan TTS cache {cache_dir}: {e}")
+            return
+
+        if total <= limit:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
     def _normalize_notes(self, text):
         """
         Normalizes note text by stripping whitespace and empty lines.
         """
-        return "\n".join(
-            line.strip()
-            for line in text.strip().splitlines()
-            if line.strip()
-        )
+        # map/filter keep the per-line work in C; stripping the whole text first
+        # is unnecessary because blank edge lines are dropped anyway
+        return "\n".join(filter(None, map(str.strip, text.splitlines())))
 
     def _hash_notes(self, text):
         """
         Calculates SHA-256 hash of the text.
         """
-        return "sha256:" + hashlib.sha256(
-            text.encode("utf-8")
+        return _sha256_text(text)
+
+    def _hash_raw_notes(self, text):
+        """
+        Calculates a fast hash of the notes as written in Markdown (before normalization).
+        """
+        return "blake2b:" + hashlib.blake2b(
+            text.encode("utf-8"), digest_size=16
         ).hexdigest()
 
     def _hash_file(self, filepath):
@@ -1360,30 +2076,108 @@ class Movie():
         """
         if not os.path.isfile(filepath):
             return None
+        return "sha256:" + self._sha256_file(filepath).hexdigest()
+
+    def _sha256_file(self, filepath):
+        """
+        Returns a SHA-256 hash object of the contents of an existing file.
+        """
+        with open(filepath, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: read/update loop runs with a large reusable buffer
+                return hashlib.file_digest(f, "sha256")
+            return self._hash_mapped_file(f)
+
+    def _hash_mapped_file(self, f):
+        """
+        Returns a SHA-256 hash object for the open binary file `f`, hashing a
+        read-only memory map so the data is taken from the page cache without copies.
+        Falls back to chunked reads for empty or unmappable files.
+        """
+        import mmap
+
         h = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size > 0:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    h.update(mm)
+                return h
+            except (OSError, ValueError):
+                pass
+        while chunk := f.read(8192):
+            h.update(chunk)
+        return h
+
+    def _fingerprint_file(self, filepath):
+        """
+        Calculates a cheap fingerprint of a file: BLAKE2b over its size, mtime
+        and the first/last 64 KiB. Reads at most 128 KiB regardless of file size.
+        """
+        st = os.stat(filepath)
+        h = hashlib.blake2b(
+            struct.pack("<Qq", st.st_size, st.st_mtime_ns), digest_size=16)
         with open(filepath, "rb") as f:
-            while chunk := f.read(8192):
-                h.update(chunk)
-        return "sha256:" + h.hexdigest()
+            h.update(f.read(_FINGERPRINT_CHUNK))
+            if st.st_size > _FINGERPRINT_CHUNK:
+                f.seek(max(_FINGERPRINT_CHUNK, st.st_size - _FINGERPRINT_CHUNK))
+                h.update(f.read(_FINGERPRINT_CHUNK))
+        return "blake2b:" + h.hexdigest()
 
-    def _calculate_source_hash(self, slide_ids):
+    def _hash_file_with_fingerprint(self, filepath, saved_hash=None, saved_fp=None):
         """
-        Calculates a unique hash representing the entire sequence of source MP4s.
-        Reads MP4 files in the order of `slide_ids`.
+        Returns `(content_hash, fingerprint)` for a media file.
+
+        If the fingerprint matches `saved_fp`, `saved_hash` is returned without
+        reading the whole file. Otherwise the full SHA-256 is calculated, so a
+        rewritten but identical file (new mtime) is still detected as unchanged.
+        Returns `(None, None)` if the file does not exist.
         """
-        h = hashlib.sha256()
+        if not os.path.isfile(filepath):
+            return None, None
+        fingerprint = self._fingerprint_file(filepath)
+        if saved_hash and fingerprint == saved_fp:
+            return saved_hash, fingerprint
+        return self._hash_file(filepath), fingerprint
 
-        for sid in slide_ids:
-            mp4_path = os.path.join(self.movie_dir, f"{sid}.mp4")
+    def _calculate_source_hash(self, slide_ids, movie_files=None):
+        """
+        Calculates a unique hash representing the entire sequence of source MP4s.
+        The SHA-256 digest of each MP4 is folded into the result in the order of `slide_ids`.
+        Digests are remembered per path and reused while the file's mtime and size
+        are unchanged, so repeated checks in one process do not re-read the clips.
 
-            if os.path.isfile(mp4_path):
-                # Update hash with file content
-                with open(mp4_path, "rb") as f:
-                    while chunk := f.read(8192):
-                        h.update(chunk)
-            else:
-                # Mark as missing in hash
-                h.update(f"{sid}:missing".encode("utf-8"))
+        Args:
+            slide_ids (list): Slide IDs in video order.
+            movie_files (set, optional): Result of `_list_movie_dir()`, if already available.
+        """
+        if movie_files is None:
+            movie_files = self._list_movie_dir()
+
+        def _digest(sid):
+            if f"{sid}.mp4" in movie_files:
+                path = os.path.join(self.movie_dir, f"{sid}.mp4")
+                st = os.stat(path)
+                signature = (st.st_mtime_ns, st.st_size)
+                cached = self._mp4_digests.get(path)
+                if cached is not None and cached[0] == signature:
+                    return cached[1]
+                digest = self._sha256_file(path).digest()
+                self._mp4_digests[path] = (signature, digest)
+                return digest
+            # Mark as missing in hash
+            return f"{sid}:missing".encode("utf-8")
+
+        # Files are hashed in parallel (hashlib releases the GIL);
+        # map() keeps the results in slide order
+        workers = max(1, min(len(slide_ids), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = list(executor.map(_digest, slide_ids))
+
+        h = hashlib.sha256()
+        for digest in digests:
+            h.update(digest)
 
         return "sha256:" + h.hexdigest()
 
@@ -1406,83 +2200,64 @@ class Movie():
         Output: `self.video_length_file`
         """
         import csv
+        import io
 
-        slides = []  # [(slide_id, title, notes_length)]
-
-        current_id = None
-        current_title = ""
-        in_notes = False
-        notes_buffer = []
-
-        with open(self.md_file, encoding="utf-8") as f:
-            for line in f:
-                # slide-id
-                if line.startswith("<!-- slide-id:"):
-                    current_id = line.strip()[len(
-                        "<!-- slide-id:"): -3].strip()
-                    current_title = ""
-                    notes_buffer = []
-                    in_notes = False
-                    continue
-
-                # Title
-                if current_id and not current_title and line.startswith("# "):
-                    current_title = line[2:].strip()
-                    continue
-
-                # notes start
-                if line.strip() == "::: notes":
-                    in_notes = True
-                    notes_buffer = []
-                    continue
+        slides_list = self._extract_slides_list()
 
-                # notes end
-                if line.strip() == ":::" and in_notes:
-                    notes_text = "".join(notes_buffer)
-                    notes_length = len(
-                        self._normalize_notes(notes_text)
-                    )
-                    slides.append(
-                        (current_id, current_title, notes_length)
-                    )
-                    in_notes = False
-                    current_id = None
-                    continue
+        # Slides with a generated MP4, in Markdown order
+        ready = []
+        for slide, paths in zip(slides_list, self._get_slide_paths(slides_list)):
+            if not os.path.isfile(paths.mp4):
+                logger.warning(f"mp4 does not exist: {paths.mp4}")
+                continue
+            ready.append((slide, paths.mp4))
+
+        # Probe durations in parallel; map() keeps the Markdown order
+        durations = []
+        if ready:
+            workers = min(len(ready), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                durations = list(executor.map(
+                    self._get_mp4_duration, [mp4 for _, mp4 in ready]))
+
+        # Build the report in memory and write it with a single call
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(
+            ["slide_id", "title", "notes_length", "duration_sec"]
+        )
 
-                # notes body
-                if in_notes:
-                    notes_buffer.append(line)
+        for (slide, _), duration in zip(ready, durations):
+            notes_length = len(self._normalize_notes(slide["notes"]))
+            writer.writerow(
+                [slide["id"], slide["title"], notes_length, f"{duration:.2f}"]
+            )
 
         os.makedirs(os.path.dirname(self.video_length_file), exist_ok=True)
 
         # Use utf-8-sig for Excel compatibility
-        with open(
+        _atomic_write(
             self.video_length_file,
-            "w",
+            lambda f: f.write(buf.getvalue()),
             encoding="utf-8-sig",
             newline=""
-        ) as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                ["slide_id", "title", "notes_length", "duration_sec"]
-            )
-
-            for slide_id, title, notes_length in slides:
-                mp4 = os.path.join(self.movie_dir, f"{slide_id}.mp4")
-
-                if not os.path.isfile(mp4):
-                    logger.warning(f"mp4 does not exist: {mp4}")
-                    continue
-
-                duration = self._get_mp4_duration(mp4)
-                writer.writerow(
-                    [slide_id, title, notes_length, f"{duration:.2f}"]
-                )
+        )
 
     def _get_mp4_duration(self, mp4_path):
         """
-        Uses ffprobe to get the duration of an MP4 file in seconds.
+        Gets the duration of an MP4 file in seconds.
+        Reads the container header in-process with PyAV when it is installed;
+        otherwise (or if PyAV cannot tell) ffprobe is used.
         """
+        av = _load_av()
+        if av is not None:
+            try:
+                with av.open(mp4_path) as container:
+                    if container.duration is not None:
+                        return container.duration / av.time_base
+            except Exception as e:
+                logger.debug(f"PyAV could not read {mp4_path}: {e}")
+
         cmd = [
             "ffprobe",
             "-v", "error",
@@ -0,0 +1,35 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to sys.path to import slidemovie module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def pytest_configure(config):
+    """
+    Mock external libraries once per session, before any test module imports
+    slidemovie. Existing entries are kept, so a re-run in the same interpreter
+    does not replace mocks that modules already hold.
+    """
+    for name in ('multiai_tts', 'pptxtoimages', 'pptxtoimages.tools'):
+        sys.modules.setdefault(name, MagicMock())
+
+
+@pytest.fixture(scope="session")
+def movie_cls():
+    """The Movie class, imported once after the external libraries are mocked."""
+    from slidemovie.core import Movie
+    return Movie
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _mock_which():
+    """
+    Mock shutil.which once for the whole run, to bypass external tool checks
+    (ffmpeg, pandoc) during initialization. Tests may patch it again locally.
+    """
+    with patch('shutil.which', return_value='/usr/bin/mocked_tool'):
+        yield
@@ -1,10 +1,7 @@
 import pytest
 import sys
 from unittest.mock import MagicMock, patch
-import os
 
-# Add parent directory to sys.path to ensure slidemovie module is found
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import slidemovie.cli as cli
 
 @pytest.fixture
@@ -22,6 +19,15 @@ def test_cli_help(capsys):
         # Verify usage/help text is printed
         assert "usage:" in captured.err or "usage:" in captured.out
 
+def test_cli_help_flag(capsys):
+    """Test that --help prints the parser's help text and exits cleanly."""
+    with patch.object(sys, 'argv', ['slidemovie', '--help']):
+        with pytest.raises(SystemExit) as e:
+            cli.main()
+
+    assert e.value.code == 0
+    assert capsys.readouterr().out == cli.build_parser().format_help()
+
 def test_cli_pptx_mode(mock_movie_class):
     """Test the --pptx option."""
     test_args = ['slidemovie', 'MyProject', '--pptx']
@@ -40,7 +46,8 @@ def test_cli_pptx_mode(mock_movie_class):
     mock_instance.configure_project_paths.assert_called_with(
         project_name='MyProject',
         source_dir='.',
-        output_root_dir=None
+        output_root_dir=None,
+        include_output=False
     )
     
     # Check if correct build method was called
@@ -67,7 +74,8 @@ def test_cli_video_mode_subproject(mock_movie_class):
         parent_project_name='ParentProj',
         subproject_name='ChildProj',
         source_parent_dir='.',
-        output_root_dir=None
+        output_root_dir=None,
+        include_output=True
     )
     
     # Verify build_all was called
@@ -1,37 +1,69 @@
+import io
 import os
 import json
+import re
 import pytest
-import sys
+import subprocess
+import threading
 from unittest.mock import MagicMock, patch
 
-# Add parent directory to sys.path to import slidemovie module
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# pandoc invocation in build_slide_pptx(); group 1 is the input Markdown file
+_PANDOC_CMD_RE = re.compile(r'^pandoc\b.*?(\S+\.md)\b')
 
-# Mock external libraries before importing core
-sys.modules['multiai_tts'] = MagicMock()
-sys.modules['pptxtoimages'] = MagicMock()
-sys.modules['pptxtoimages.tools'] = MagicMock()
+@pytest.fixture(scope="module")
+def shared_movie(movie_cls):
+    """A single Movie instance for the module and its attributes right after __init__."""
+    m = movie_cls()
+    return m, dict(vars(m))
 
-from slidemovie.core import Movie
-
-@pytest.fixture
-def mock_tools(mocker):
-    """
-    Mock shutil.which to bypass external tool checks (ffmpeg, pandoc)
-    during initialization.
-    """
-    mocker.patch('shutil.which', return_value='/usr/bin/mocked_tool')
-
-@pytest.fixture
-def movie(mock_tools):
-    """Fixture to create a Movie instance."""
-    m = Movie()
+def reset(m, attrs):
+    """Restores the attributes set by __init__ and gives the per-run caches fresh objects."""
+    m.__dict__.clear()
+    m.__dict__.update(attrs)
+    m._md_cache = None
+    m._slide_paths = None
+    m._tts_local = threading.local()
+    m._state_pending = 0
+    m._mp4_digests = {}
     # Reset output_root to None to ensure tests rely on the source_dir structure
     m.output_root = None
     # Ensure output_filename is None by default (mimic init state)
     m.output_filename = None
     return m
 
+@pytest.fixture
+def movie(shared_movie):
+    """Fixture returning the shared Movie instance, reset for this test."""
+    return reset(*shared_movie)
+
+@pytest.fixture
+def memory_md(mocker):
+    """
+    Serves Markdown from memory so parsing tests touch no files.
+    Call it with (movie, content); it returns a dict collecting the text
+    passed to `_atomic_write()`, keyed by path.
+    """
+    written = {}
+    real_stat = os.stat
+
+    def fake_atomic_write(path, write, mode='w', **open_kwargs):
+        buf = io.BytesIO() if 'b' in mode else io.StringIO()
+        write(buf)
+        written[path] = buf.getvalue()
+
+    def load(movie, content, path="memory.md"):
+        size = len(content.encode('utf-8'))
+        movie.md_file = path
+        mocker.patch('slidemovie.core.open', mocker.mock_open(read_data=content), create=True)
+        mocker.patch('os.path.exists', side_effect=lambda p: p == path)
+        mocker.patch('os.stat', side_effect=lambda p, *args, **kwargs: (
+            os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, 0, 0))
+            if p == path else real_stat(p, *args, **kwargs)))
+        mocker.patch('slidemovie.core._atomic_write', side_effect=fake_atomic_write)
+        return written
+
+    return load
+
 class TestMovieConfig:
     def test_default_settings(self, movie):
         """Test if settings are loaded (checking key existence)."""
@@ -40,7 +72,7 @@ class TestMovieConfig:
         # [Fix] Check for output_filename
         assert hasattr(movie, 'output_filename')
 
-    def test_load_settings_override(self, mock_tools, tmp_path):
+    def test_load_settings_override(self, tmp_path):
         """Test overriding settings via config.json logic."""
         pass 
 
@@ -85,6 +117,21 @@ class TestPathConfiguration:
         assert movie.video_file.endswith("custom_output_name.mp4")
         assert "test_proj.mp4" not in movie.video_file
 
+    def test_configure_project_paths_without_output(self, movie, tmp_path):
+        """Test that include_output=False computes paths without creating directories."""
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+
+        movie.configure_project_paths(
+            project_name="test_proj",
+            source_dir=str(source_dir),
+            include_output=False
+        )
+
+        assert movie.slide_file == str(source_dir / "test_proj.pptx")
+        assert movie.movie_dir == str(source_dir / "movie" / "test_proj")
+        assert not os.path.exists(source_dir / "movie")
+
     def test_configure_subproject_paths(self, movie, tmp_path):
         """Test path configuration for subproject (Parent/Child) mode."""
         movie.output_root = None
@@ -108,10 +155,7 @@ class TestPathConfiguration:
         # [Fix] Verify default filename (Parent-Child)
         assert movie.video_file.endswith("parent_proj-child_sub.mp4")
 
-class TestMarkdownProcessing:
-    def test_ensure_slide_ids(self, movie, tmp_path):
-        """Test if slide-ids are automatically injected into Markdown."""
-        md_content = """# Slide 1
+_MD_ENSURE_IDS = """# Slide 1
 ::: notes
 Note 1
 :::
@@ -121,21 +165,8 @@ Note 1
 Note 2
 :::
 """
-        md_file = tmp_path / "test.md"
-        md_file.write_text(md_content, encoding='utf-8')
-        
-        movie.md_file = str(md_file)
-        movie.project_id = "TEST"
-        
-        movie._ensure_slide_ids()
-        
-        updated_content = md_file.read_text(encoding='utf-8')
-        assert "<!-- slide-id: TEST-01 -->" in updated_content
-        assert "<!-- slide-id: TEST-02 -->" in updated_content
 
-    def test_extract_slides_list(self, movie, tmp_path):
-        """Test extracting slide information from Markdown."""
-        md_content = """<!-- slide-id: s-01 -->
+_MD_EXTRACT = """<!-- slide-id: s-01 -->
 # Title A
 ::: notes
 Note A
@@ -145,18 +176,211 @@ Note A
 <!-- video-file: demo.mp4 -->
 # Title B
 """
-        md_file = tmp_path / "extract.md"
-        md_file.write_text(md_content, encoding='utf-8')
-        movie.md_file = str(md_file)
-        
+
+# (mode, Markdown, expected ids, titles, video files); "ensure" runs
+# _ensure_slide_ids() first and parses its output, "extract" parses as-is
+SLIDE_CASES = [
+    pytest.param("ensure", _MD_ENSURE_IDS, ["TEST-01", "TEST-02"],
+                 ["Slide 1", "Slide 2"], [None, None], id="ensure_slide_ids"),
+    pytest.param("extract", _MD_EXTRACT, ["s-01", "s-02"],
+                 ["Title A", "Title B"], [None, "demo.mp4"], id="extract_slides_list"),
+]
+
+class TestMarkdownProcessing:
+    @pytest.mark.parametrize("mode, md_content, expected_ids, expected_titles, expected_videos",
+                             SLIDE_CASES)
+    def test_slide_parsing(self, movie, memory_md, mode, md_content,
+                           expected_ids, expected_titles, expected_videos):
+        """Test slide-id injection and slide extraction from Markdown."""
+        written = memory_md(movie, md_content)
+        movie.project_id = "TEST"
+
+        if mode == "ensure":
+            movie._ensure_slide_ids()
+            updated_content = written[movie.md_file]
+            for slide_id in expected_ids:
+                assert f"<!-- slide-id: {slide_id} -->" in updated_content
+            memory_md(movie, updated_content)
+
         slides = movie._extract_slides_list()
-        
-        assert len(slides) == 2
-        assert slides[0]['id'] == 's-01'
-        assert slides[0]['title'] == 'Title A'
-        
-        assert slides[1]['id'] == 's-02'
-        assert slides[1]['video_file'] == 'demo.mp4'
+
+        assert [s['id'] for s in slides] == expected_ids
+        assert [s['title'] for s in slides] == expected_titles
+        assert [s['video_file'] for s in slides] == expected_videos
+
+    def test_normalize_notes(self, movie):
+        """Test that lines are stripped and blank lines dropped for every line break."""
+        text = "\n  first line \r\n\t\n\u3000second\u2028 third\x0b\n   \n"
+        assert movie._normalize_notes(text) == "first line\nsecond\nthird"
+        assert movie._normalize_notes(" \n\t") == ""
+
+class TestHashing:
+    def test_hash_mapped_file(self, movie, tmp_path):
+        """Test the memory-mapped hash used before Python 3.11, including empty files."""
+        import hashlib
+        for data in (os.urandom(100000), b""):
+            data_file = tmp_path / "data.bin"
+            data_file.write_bytes(data)
+            with open(data_file, "rb") as f:
+                h = movie._hash_mapped_file(f)
+            assert h.hexdigest() == hashlib.sha256(data).hexdigest()
+
+    def test_hash_file_with_fingerprint(self, movie, tmp_path, mocker):
+        """Test that a matching fingerprint reuses the stored hash without a full read."""
+        media = tmp_path / "slide.png"
+        media.write_bytes(b"x" * 200000)
+
+        full_hash, fp = movie._hash_file_with_fingerprint(str(media))
+        assert full_hash == movie._hash_file(str(media))
+
+        spy = mocker.spy(movie, '_hash_file')
+        assert movie._hash_file_with_fingerprint(str(media), full_hash, fp) == (full_hash, fp)
+        spy.assert_not_called()
+
+        # Same content with a new mtime: full hash is recomputed and still matches
+        os.utime(media, ns=(0, 0))
+        new_hash, new_fp = movie._hash_file_with_fingerprint(str(media), full_hash, fp)
+        assert new_fp != fp
+        assert new_hash == full_hash
+        spy.assert_called_once()
+
+    def test_get_wav_duration(self, movie, tmp_path):
+        """Test WAV header parsing, including extra chunks and a truncated data chunk."""
+        import struct
+        import wave
+        wav_file = tmp_path / "a.wav"
+        with wave.open(str(wav_file), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 12000)
+        assert movie._get_wav_duration(str(wav_file)) == 1.5
+
+        # LIST chunk before fmt, data size left at 0xFFFFFFFF by a streaming encoder
+        fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+        body = (b"WAVE" + b"LIST" + struct.pack("<I", 3) + b"abc\0"
+                + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+                + b"data" + struct.pack("<I", 0xFFFFFFFF) + b"\0\0" * 4000)
+        wav_file.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+        assert movie._get_wav_duration(str(wav_file)) == 0.5
+
+    def test_calculate_source_hash(self, movie, tmp_path):
+        """Test that the source hash folds per-file digests in slide order."""
+        import hashlib
+        movie.movie_dir = str(tmp_path)
+        (tmp_path / "s-01.mp4").write_bytes(b"first")
+        (tmp_path / "s-02.mp4").write_bytes(b"second")
+
+        expected = hashlib.sha256(
+            hashlib.sha256(b"second").digest()
+            + hashlib.sha256(b"first").digest()
+            + b"s-03:missing").hexdigest()
+        assert movie._calculate_source_hash(["s-02", "s-01", "s-03"]) == "sha256:" + expected
+        assert (movie._calculate_source_hash(["s-01", "s-02", "s-03"])
+                != movie._calculate_source_hash(["s-02", "s-01", "s-03"]))
+
+    def test_calculate_source_hash_reuses_digests(self, movie, tmp_path, mocker):
+        """Test that unchanged MP4s are not hashed again."""
+        movie.movie_dir = str(tmp_path)
+        clip = tmp_path / "s-01.mp4"
+        clip.write_bytes(b"first")
+        spy = mocker.spy(movie, '_sha256_file')
+
+        first = movie._calculate_source_hash(["s-01"])
+        assert movie._calculate_source_hash(["s-01"]) == first
+        assert spy.call_count == 1
+
+        clip.write_bytes(b"changed")
+        assert movie._calculate_source_hash(["s-01"]) != first
+        assert spy.call_count == 2
+
+    def test_get_mp4_duration_with_pyav(self, movie, mocker):
+        """Test that PyAV is used for MP4 durations when available."""
+        container = MagicMock(duration=2500000)
+        container.__enter__.return_value = container
+        av = MagicMock(time_base=1000000)
+        av.open.return_value = container
+        mocker.patch('slidemovie.core._load_av', return_value=av)
+        mock_run = mocker.patch('slidemovie.core.subprocess.run')
+
+        assert movie._get_mp4_duration("a.mp4") == 2.5
+        mock_run.assert_not_called()
+
+class TestFileIO:
+    def test_atomic_write(self, tmp_path):
+        """Test that a failed write leaves the original file and no temp file."""
+        from slidemovie.core import _atomic_write
+        target = tmp_path / "status.json"
+        _atomic_write(str(target), lambda f: f.write("old"), encoding="utf-8")
+
+        def fail(f):
+            f.write("partial")
+            raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError):
+            _atomic_write(str(target), fail, encoding="utf-8")
+        assert target.read_text(encoding="utf-8") == "old"
+        assert os.listdir(tmp_path) == ["status.json"]
+
+    def test_atomic_write_symlink_and_mode(self, tmp_path):
+        """Test that a symlinked source keeps its link, and the target keeps its mode."""
+        from slidemovie.core import _atomic_write
+        real = tmp_path / "real.md"
+        real.write_text("old", encoding="utf-8")
+        os.chmod(real, 0o640)
+        link = tmp_path / "slides.md"
+        link.symlink_to(real)
+
+        _atomic_write(str(link), lambda f: f.write("new"), encoding="utf-8")
+        assert link.is_symlink()
+        assert real.read_text(encoding="utf-8") == "new"
+        assert os.stat(real).st_mode & 0o777 == 0o640
+
+    def test_dumps_json_matches_stdlib(self, mocker):
+        """Test that the orjson and json serializers write equivalent state files."""
+        from slidemovie import core
+        if core.orjson is None:
+            pytest.skip("orjson is not installed")
+        state = {
+            "project_id": "p",
+            "slides": {"s1": {"slide_index": 1, "audio": {
+                "notes_hash": None, "title": "日本語"}, "video": {}}},
+        }
+        floats = {"slides": {"s1": {"audio": {"duration_sec": [3.25, 1e-05, 1e16]}}}}
+        fast, fast_floats = core._dumps_json(state), core._dumps_json(floats)
+        mocker.patch.object(core, 'orjson', None)
+        # Same bytes without floats; float formatting may differ between the two
+        assert fast == core._dumps_json(state)
+        assert json.loads(fast_floats) == json.loads(core._dumps_json(floats))
+
+    def test_save_audio_state_order(self, movie, tmp_path):
+        """Test that slides are written in slide_index order."""
+        movie.status_file = str(tmp_path / "status.json")
+        slides = {"b": {"slide_index": 2}, "a": {"slide_index": 1}}
+        state = {"slides": slides}
+        movie._save_audio_state(state)
+        assert state["slides"] is slides
+        assert list(slides) == ["a", "b"]
+        with open(movie.status_file, encoding="utf-8") as f:
+            assert list(json.load(f)["slides"]) == ["a", "b"]
+
+    def test_state_session_saves_once(self, movie, tmp_path, mocker):
+        """Test that migration and metadata sync are written in a single save."""
+        movie.status_file = str(tmp_path / "status.json")
+        with open(movie.status_file, "w", encoding="utf-8") as f:
+            json.dump({"slides": {}}, f)
+        spy = mocker.spy(movie, '_save_audio_state')
+
+        slides_list = [{"id": "s1", "title": "T", "video_file": None}]
+        with movie._state_session() as state:
+            movie._sync_slide_metadata(state, slides_list)
+            assert spy.call_count == 0
+
+        assert spy.call_count == 1
+        with open(movie.status_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        assert "build_config" in saved and "tts_config" in saved
+        assert saved["slides"]["s1"]["title"] == "T"
 
 class TestBuildLogic:
     def test_build_slide_pptx(self, movie, tmp_path, mocker):
@@ -175,21 +399,288 @@ class TestBuildLogic:
         movie.status_file = str(tmp_path / "status.json")
         
         # Mock subprocess
-        mock_run = mocker.patch('subprocess.check_call')
+        mock_run = mocker.patch('subprocess.run')
         
         movie.build_slide_pptx()
         
         # Verify call
         mock_run.assert_called_once()
         args, _ = mock_run.call_args
-        command_str = args[0]
-        assert "pandoc" in command_str
-        assert str(md_file) in command_str
+        command_str = " ".join(args[0])
+        m = _PANDOC_CMD_RE.search(command_str)
+        assert m and m.group(1) == str(md_file)
+
+    def test_build_slide_audio(self, movie, tmp_path, mocker):
+        """Test that TTS runs only for slides whose notes changed."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text(
+            "<!-- slide-id: a-01 -->\n# A\n::: notes\nHello\n:::\n"
+            "<!-- slide-id: a-02 -->\n# B\n::: notes\nWorld\n:::\n",
+            encoding='utf-8')
+        movie.md_file = str(md_file)
+        movie.movie_dir = str(tmp_path)
+        movie.status_file = str(tmp_path / "status.json")
+        movie.project_id = "a"
+
+        def fake_speak(text, wav_path, additional_prompt="", use_cache=True):
+            with open(wav_path, "wb") as f:
+                f.write(text.encode())
+
+        mocker.patch('slidemovie.core._TTS_CACHE_DIR', str(tmp_path / "cache"))
+        speak = mocker.patch.object(movie, '_speak_to_wav', side_effect=fake_speak)
+        mocker.patch.object(movie, 'prepend_silence_batch')
+        mocker.patch.object(movie, '_get_wav_duration', return_value=2.0)
+
+        movie.build_slide_audio()
+
+        assert sorted(c.args[0] for c in speak.call_args_list) == ["Hello", "World"]
+        state = json.loads((tmp_path / "status.json").read_text(encoding='utf-8'))
+        assert state["slides"]["a-01"]["audio"]["status"] == "generated"
+        assert state["slides"]["a-02"]["audio"]["duration_sec"] == 2.0
+        assert state["slides"]["a-02"]["audio"]["tts_config_hash"] == movie._hash_tts_config()
+
+        # Only the edited slide is synthesized again
+        md_file.write_text(
+            md_file.read_text(encoding='utf-8').replace("World", "Planet"),
+            encoding='utf-8')
+        speak.reset_mock()
+        movie.build_slide_audio()
+        assert [c.args[0] for c in speak.call_args_list] == ["Planet"]
+
+        # Unchanged slides skip normalization; a whitespace-only edit needs no TTS
+        md_file.write_text(
+            md_file.read_text(encoding='utf-8').replace("Planet", "Planet\n\n  Earth "),
+            encoding='utf-8')
+        speak.reset_mock()
+        normalize = mocker.spy(movie, '_normalize_notes')
+        movie.build_slide_audio()
+        assert [c.args[0] for c in speak.call_args_list] == ["Planet\nEarth"]
+        assert normalize.call_count == 1
+
+        md_file.write_text(
+            md_file.read_text(encoding='utf-8').replace("\n\n  Earth ", "\n  Earth"),
+            encoding='utf-8')
+        speak.reset_mock()
+        normalize.reset_mock()
+        movie.build_slide_audio()
+        speak.assert_not_called()
+        assert normalize.call_count == 1
+        movie.build_slide_audio()
+        assert normalize.call_count == 1
+
+    def test_build_slide_audio_abort_keeps_finished(self, movie, tmp_path, mocker):
+        """Test that an aborted run still records audio finished by other requests."""
+        import time
+        md_file = tmp_path / "test.md"
+        md_file.write_text(
+            "<!-- slide-id: a-01 -->\n# A\n::: notes\nHello\n:::\n"
+            "<!-- slide-id: a-02 -->\n# B\n::: notes\nWorld\n:::\n",
+            encoding='utf-8')
+        movie.md_file = str(md_file)
+        movie.movie_dir = str(tmp_path)
+        movie.status_file = str(tmp_path / "status.json")
+        movie.project_id = "a"
+        movie.tts_concurrency = 2
+
+        def fake_speak(text, wav_path, additional_prompt="", use_cache=True):
+            if text == "World":
+                raise RuntimeError("quota")
+            # Still in flight when the failure is seen
+            time.sleep(0.2)
+            with open(wav_path, "wb") as f:
+                f.write(text.encode())
+
+        mocker.patch('slidemovie.core._TTS_CACHE_DIR', str(tmp_path / "cache"))
+        mocker.patch.object(movie, '_speak_to_wav', side_effect=fake_speak)
+        silence = mocker.patch.object(movie, 'prepend_silence_batch')
+        mocker.patch.object(movie, '_get_wav_duration', return_value=2.0)
+
+        with pytest.raises(RuntimeError):
+            movie.build_slide_audio()
+
+        silence.assert_called_once_with([str(tmp_path / "a-01.wav")])
+        state = json.loads((tmp_path / "status.json").read_text(encoding='utf-8'))
+        assert state["slides"]["a-01"]["audio"]["status"] == "generated"
+        assert state["slides"]["a-02"]["audio"]["status"] != "generated"
+
+    def test_prepend_silence_batch(self, movie, tmp_path, mocker):
+        """Test that several WAV files are processed by one ffmpeg run."""
+        wavs = [str(tmp_path / f"{n}.wav") for n in range(3)]
+        for wav in wavs:
+            open(wav, "wb").close()
+
+        def fake_run(cmd, **kwargs):
+            for i, arg in enumerate(cmd):
+                if arg == "-map":
+                    with open(cmd[i + 2], "w") as f:
+                        f.write(cmd[i + 1])
+            return subprocess.CompletedProcess(cmd, 0)
+
+        mock_run = mocker.patch('slidemovie.core.subprocess.run', side_effect=fake_run)
+        movie.prepend_silence_batch(wavs)
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args.args[0]
+        assert cmd[cmd.index("-filter_complex") + 1].startswith("[0:a]asplit=3[s1][s2][s3];")
+        assert [open(wav).read() for wav in wavs] == ["[o1]", "[o2]", "[o3]"]
+        assert sorted(os.listdir(tmp_path)) == ["0.wav", "1.wav", "2.wav"]
+
+    def test_speak_to_wav_cache(self, movie, tmp_path, mocker):
+        """Test that identical TTS requests are served from the cache."""
+        mocker.patch('slidemovie.core._TTS_CACHE_DIR', str(tmp_path / "cache"))
+        client = MagicMock(error=None)
+        client.save_tts.side_effect = lambda text, path: open(path, "wb").write(b"RIFF")
+        mocker.patch('slidemovie.core.multiai_tts.Prompt', return_value=client)
+
+        movie._speak_to_wav("Hello", str(tmp_path / "a.wav"))
+        movie._speak_to_wav("Hello", str(tmp_path / "b.wav"))
+        assert client.save_tts.call_count == 1
+        assert (tmp_path / "b.wav").read_bytes() == b"RIFF"
+
+        # A forced regeneration bypasses the cache
+        movie._speak_to_wav("Hello", str(tmp_path / "b.wav"), use_cache=False)
+        assert client.save_tts.call_count == 2
+
+    def test_speak_to_wav_cache_is_copy(self, movie, tmp_path, mocker):
+        """Test that the cache entry is independent of the output WAV."""
+        mocker.patch('slidemovie.core._TTS_CACHE_DIR', str(tmp_path / "cache"))
+        client = MagicMock(error=None)
+        audio = {"Old": b"RIFF-old", "New": b"RIFF-new"}
+        client.save_tts.side_effect = lambda text, path: open(path, "wb").write(audio[text])
+        mocker.patch('slidemovie.core.multiai_tts.Prompt', return_value=client)
+        movie.tts_use_prompt = False
+        wav = tmp_path / "s.wav"
+
+        movie._speak_to_wav("Old", str(wav))
+        cache_path = movie._get_tts_cache_path("Old")
+        assert not os.path.samefile(wav, cache_path)
+
+        # New audio written into the same WAV leaves the cached entry unchanged
+        movie._speak_to_wav("New", str(wav))
+        with open(cache_path, "rb") as f:
+            assert f.read() == b"RIFF-old"
+
+    def test_build_slide_images(self, movie, tmp_path, mocker):
+        """Test that generated images are renamed to slide-ids in numeric order."""
+        ids = [f"i-{n:02d}" for n in range(1, 12)]
+        md_file = tmp_path / "test.md"
+        md_file.write_text(
+            "".join(f"<!-- slide-id: {sid} -->\n# T\n::: notes\nN\n:::\n" for sid in ids),
+            encoding='utf-8')
+        (tmp_path / "test.pptx").write_bytes(b"pptx")
+        movie.md_file = str(md_file)
+        movie.slide_file = str(tmp_path / "test.pptx")
+        movie.movie_dir = str(tmp_path)
+        movie.status_file = str(tmp_path / "status.json")
+        movie.project_id = "i"
+
+        def fake_convert():
+            for n in range(1, 12):
+                (tmp_path / f"slide_{n}.png").write_bytes(str(n).encode())
+
+        converter = mocker.patch('pptxtoimages.tools.PPTXToImageConverter')
+        converter.return_value.convert.side_effect = fake_convert
+
+        movie.build_slide_images()
+
+        for n, sid in enumerate(ids, 1):
+            assert (tmp_path / f"{sid}.png").read_bytes() == str(n).encode()
+        assert not list(tmp_path.glob("slide_*.png"))
+
+    def test_tts_client_reuse(self, movie, tmp_path, mocker):
+        """Test that the TTS client is built once per thread and rebuilt on config change."""
+        movie.tts_cache_enabled = False
+        prompt = mocker.patch('slidemovie.core.multiai_tts.Prompt',
+                              side_effect=lambda: MagicMock(error=None))
+
+        movie._speak_to_wav("A", str(tmp_path / "a.wav"))
+        movie._speak_to_wav("B", str(tmp_path / "b.wav"))
+        assert prompt.call_count == 1
+
+        movie.tts_voice = "other"
+        movie._speak_to_wav("C", str(tmp_path / "c.wav"))
+        assert prompt.call_count == 2
+
+    def test_build_slide_videos(self, movie, tmp_path, mocker):
+        """Test that every slide with fresh assets is encoded and recorded in state."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text(
+            "<!-- slide-id: v-01 -->\n# A\n::: notes\nA\n:::\n"
+            "<!-- slide-id: v-02 -->\n# B\n::: notes\nB\n:::\n",
+            encoding='utf-8')
+        movie.md_file = str(md_file)
+        movie.movie_dir = str(tmp_path)
+        movie.status_file = str(tmp_path / "status.json")
+        movie.project_id = "v"
+        for sid in ("v-01", "v-02"):
+            (tmp_path / f"{sid}.png").write_bytes(b"png " + sid.encode())
+            (tmp_path / f"{sid}.wav").write_bytes(b"wav " + sid.encode())
+
+        def fake_run(cmd, **kwargs):
+            open(cmd[-1], "wb").close()
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout="out_time_us=1500000\nprogress=end\n", stderr="")
+
+        mock_run = mocker.patch('slidemovie.core.subprocess.run', side_effect=fake_run)
+        probe = mocker.patch.object(movie, '_get_mp4_duration', return_value=9.9)
+
+        movie.build_slide_videos()
+
+        assert mock_run.call_count == 2
+        state = json.loads((tmp_path / "status.json").read_text(encoding='utf-8'))
+        for sid in ("v-01", "v-02"):
+            assert state["slides"][sid]["video"]["status"] == "generated"
+            assert state["slides"][sid]["video"]["duration_sec"] == 1.5
+        # Durations come from ffmpeg's progress report, not ffprobe
+        probe.assert_not_called()
+
+        # A second run finds everything unchanged
+        mock_run.reset_mock()
+        movie.build_slide_videos()
+        mock_run.assert_not_called()
+
+        # Changing the encoder settings rebuilds the clips
+        movie.x264_preset = "medium"
+        movie.build_slide_videos()
+        assert mock_run.call_count == 2
+        cmd = mock_run.call_args.args[0]
+        assert cmd[cmd.index("-preset") + 1] == "medium"
+
+    def test_write_video_length_csv(self, movie, tmp_path, mocker):
+        """Test the CSV report of slide titles, notes length and clip durations."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text(
+            "<!-- slide-id: c-01 -->\n# First\n::: notes\n Hello \n\n world\n:::\n"
+            "<!-- slide-id: c-02 -->\n# Second\n::: notes\nBye\n:::\n"
+            "<!-- slide-id: c-03 -->\n# Third\n::: notes\nMissing\n:::\n",
+            encoding='utf-8')
+        movie.md_file = str(md_file)
+        movie.movie_dir = str(tmp_path)
+        movie.video_length_file = str(tmp_path / "video_length.csv")
+        for sid in ("c-01", "c-02"):
+            (tmp_path / f"{sid}.mp4").write_bytes(b"mp4")
+        mocker.patch.object(movie, '_get_mp4_duration', return_value=3.0)
+
+        movie.write_video_length_csv()
+
+        lines = (tmp_path / "video_length.csv").read_text(encoding='utf-8-sig').splitlines()
+        assert lines == [
+            "slide_id,title,notes_length,duration_sec",
+            "c-01,First,11,3.00",
+            "c-02,Second,3,3.00",
+        ]
+
+    def test_check_external_tools_missing(self, mocker, movie_cls):
+        """Test if program exits at the first missing tool."""
+        calls = []
+
+        def which(tool):
+            calls.append(tool)
+            return None
 
-    def test_check_external_tools_missing(self, mocker):
-        """Test if program exits when tools are missing."""
-        mocker.patch('shutil.which', return_value=None)
+        mocker.patch('shutil.which', side_effect=which)
         
         with pytest.raises(SystemExit) as e:
-            Movie()
+            movie_cls()
         assert e.value.code == 1
+        assert len(calls) == 1